@@ -7,7 +7,8 @@ Tamil Voice Plans Assistant - Main Application
 
 import os
 import sys
-import json
+import pickle
+import queue
 import signal
 import threading
 from datetime import datetime
@@ -16,8 +17,10 @@ from pathlib import Path
 # Add src to path
 sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
 
-from src.voice_assistant import TamilVoiceAssistant
-from src.utils import setup_logging, print_tamil, play_welcome_sound
+from src.utils import setup_logging, print_tamil, play_welcome_sound, json_loads
+
+# Parsed config.json cache, keyed by (path, mtime, size)
+CONFIG_CACHE_PATH = Path.home() / ".cache" / "april" / "config.pkl"
 
 class MainApplication:
     def __init__(self):
@@ -38,14 +41,53 @@ class MainApplication:
         self.is_running = False
         self.continuous_mode = False
         
+        # Newly added documents are indexed by a background worker
+        self._index_queue = queue.Queue()
+        self._index_thread = threading.Thread(target=self._index_worker, daemon=True)
+        self._index_thread.start()
+        
     def load_config(self):
-        """Load configuration file"""
+        """Load configuration file, reusing the parsed copy while it is unchanged"""
         try:
-            with open(self.config_path, 'r', encoding='utf-8') as f:
-                return json.load(f)
+            st = os.stat(self.config_path)
         except FileNotFoundError:
             print("⚠️ கட்டமைப்பு கோப்பு கிடைக்கவில்லை. இயல்புநிலைகளைப் பயன்படுத்துகிறது.")
             return self.get_default_config()
+        
+        key = (str(self.config_path), st.st_mtime_ns, st.st_size)
+        cache = self._read_config_cache()
+        if key in cache:
+            return cache[key]
+        
+        with open(self.config_path, 'rb') as f:
+            config = json_loads(f.read())
+        
+        # Keep a single entry per config path
+        cache = {k: v for k, v in cache.items() if k[0] != key[0]}
+        cache[key] = config
+        self._write_config_cache(cache)
+        
+        return config
+    
+    def _read_config_cache(self):
+        """Read the parsed config cache, empty if missing or unreadable"""
+        try:
+            with open(CONFIG_CACHE_PATH, 'rb') as f:
+                cache = pickle.load(f)
+            return cache if isinstance(cache, dict) else {}
+        except Exception:
+            return {}
+    
+    def _write_config_cache(self, cache):
+        """Write the parsed config cache (best effort)"""
+        try:
+            CONFIG_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = CONFIG_CACHE_PATH.with_suffix('.tmp')
+            with open(tmp_path, 'wb') as f:
+                pickle.dump(cache, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, CONFIG_CACHE_PATH)
+        except Exception:
+            pass
     
     def get_default_config(self):
         """Return default configuration"""
@@ -67,6 +109,9 @@ class MainApplication:
         print_tamil("🔧 உதவியாளரை துவக்குகிறது...")
         
         try:
+            # Imported here so menu-only flows never load torch/whisper
+            from src.voice_assistant import TamilVoiceAssistant
+            
             self.assistant = TamilVoiceAssistant(config=self.config)
             print_tamil("✅ உதவியாளர் தயார்!")
             return True
@@ -213,11 +258,8 @@ class MainApplication:
             shutil.copy2(file_path, dest_path)
             print_tamil(f"✅ கோப்பு பதிவேற்றப்பட்டது: {dest_path.name}")
             
-            # Re-index if assistant is running
-            if self.assistant:
-                print_tamil("🔄 அறிவுத் தளத்தை புதுப்பிக்கிறது...")
-                self.assistant.rebuild_knowledge_base()
-                print_tamil("✅ அறிவுத் தளம் புதுப்பிக்கப்பட்டது")
+            # Re-index in the background if assistant is running
+            self.queue_for_indexing(dest_path)
                 
         except Exception as e:
             print_tamil(f"❌ பதிவேற்றம் தோல்வி: {e}")
@@ -250,15 +292,37 @@ class MainApplication:
             
             print_tamil(f"✅ ஆவணம் சேமிக்கப்பட்டது: {filename}")
             
-            # Re-index if assistant is running
-            if self.assistant:
-                print_tamil("🔄 அறிவுத் தளத்தை புதுப்பிக்கிறது...")
-                self.assistant.rebuild_knowledge_base()
-                print_tamil("✅ அறிவுத் தளம் புதுப்பிக்கப்பட்டது")
+            # Re-index in the background if assistant is running
+            self.queue_for_indexing(file_path)
                 
         except Exception as e:
             print_tamil(f"❌ ஆவணத்தை சேமிக்க முடியவில்லை: {e}")
     
+    def queue_for_indexing(self, path):
+        """Hand a new document to the background indexing worker"""
+        if self.assistant:
+            self._index_queue.put(Path(path))
+            print_tamil("🕒 அறிவுத் தளத்தில் சேர்க்க வரிசைப்படுத்தப்பட்டது")
+    
+    def _index_worker(self):
+        """Index queued documents, batching everything queued at the time"""
+        while True:
+            paths = [self._index_queue.get()]
+            while True:
+                try:
+                    paths.append(self._index_queue.get_nowait())
+                except queue.Empty:
+                    break
+            
+            try:
+                self.assistant.add_documents_batched(paths, batch_size=100)
+                self.logger.info(f"Indexed {len(paths)} document(s) in the background")
+            except Exception as e:
+                self.logger.error(f"Background indexing failed: {e}")
+            finally:
+                for _ in paths:
+                    self._index_queue.task_done()
+    
     def open_settings(self):
         """Open application settings"""
         print_tamil("\n⚙️ அமைப்புகள்")
@@ -276,8 +340,28 @@ class MainApplication:
             print_tamil("முதலில் சில திட்ட ஆவணங்களை சேர்க்கவும்.")
             self.add_documents()
         
-        # Run interactive mode
-        self.interactive_mode()
+        # Run interactive mode (also unwinds through here on signal_handler's exit)
+        try:
+            self.interactive_mode()
+        finally:
+            self.shutdown()
+    
+    def shutdown(self, timeout: float = 60.0):
+        """Let queued indexing finish, then save deferred state"""
+        # Queue.join has no timeout, so wait on it from a helper thread
+        waiter = threading.Thread(target=self._index_queue.join, daemon=True)
+        waiter.start()
+        waiter.join(0.1)
+        if waiter.is_alive():
+            print_tamil("⏳ பின்னணி அட்டவணைப்படுத்தல் முடியும் வரை காத்திருக்கிறது...")
+            waiter.join(timeout)
+            if waiter.is_alive():
+                # The manifest is saved last, so unfinished files are re-indexed next start
+                self.logger.warning("Background indexing still running at exit")
+        
+        # Query cache writes are deferred; keep the last ones
+        if self.assistant:
+            self.assistant.flush_query_cache()
 
 def signal_handler(signum, frame):
     """Handle interrupt signals"""
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+வேகமான கணித செயல்பாடுகள் (Compiled Numeric Kernels)
+"""
+
+from typing import Tuple
+import numpy as np
+
+# Numba JIT-compiles the similarity scan; NumPy vectorization otherwise
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+if njit is not None:
+    # Serial on purpose: matrices are small (a few hundred rows), and the
+    # kernel is called from several threads at once, which Numba's default
+    # parallel threading layer does not support. No fastmath either: the
+    # top-k buffer relies on -inf sentinels
+    @njit(cache=True)
+    def _topk_cosine(mat, q, k):
+        """Top-k rows of mat by dot product with q, best first"""
+        n, dim = mat.shape
+        scores = np.empty(n, dtype=np.float32)
+        for i in range(n):
+            acc = np.float32(0.0)
+            for j in range(dim):
+                acc += mat[i, j] * q[j]
+            scores[i] = acc
+
+        # Keep the best k in a small sorted buffer (k is tiny)
+        k = min(k, n)
+        top_idx = np.full(k, -1, dtype=np.int64)
+        top_val = np.full(k, -np.inf, dtype=np.float32)
+        for i in range(n):
+            s = scores[i]
+            if s <= top_val[k - 1]:
+                continue
+            pos = k - 1
+            while pos > 0 and top_val[pos - 1] < s:
+                top_val[pos] = top_val[pos - 1]
+                top_idx[pos] = top_idx[pos - 1]
+                pos -= 1
+            top_val[pos] = s
+            top_idx[pos] = i
+        return top_idx, top_val
+else:
+    def _topk_cosine(mat, q, k):
+        """Top-k rows of mat by dot product with q, best first"""
+        scores = mat @ q
+        k = min(k, scores.size)
+        top_idx = np.argpartition(-scores, k - 1)[:k]
+        top_idx = top_idx[np.argsort(-scores[top_idx])]
+        return top_idx, scores[top_idx]
+
+
+def topk_cosine(mat: np.ndarray, q: np.ndarray, k: int = 1) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Find the rows most similar to a query vector
+
+    Args:
+        mat: (N, d) float32 matrix of L2-normalized rows
+        q: (d,) float32 L2-normalized query
+        k: Number of results
+
+    Returns:
+        Tuple of (indices, cosine similarities), best first
+    """
+    if mat.shape[0] == 0 or k <= 0:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+
+    return _topk_cosine(
+        np.ascontiguousarray(mat, dtype=np.float32),
+        np.ascontiguousarray(q, dtype=np.float32),
+        k
+    )
+
+
+def warmup(dim: int = 384):
+    """Trigger JIT compilation ahead of the first real query"""
+    topk_cosine(np.zeros((1, dim), dtype=np.float32), np.zeros(dim, dtype=np.float32), 1)
@@ -6,30 +6,110 @@
 
 import os
 import re
+import mmap
+import hashlib
+import multiprocessing
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Tuple, Iterator
+import numpy as np
 import PyPDF2
 from docx import Document
 
+# PDFium (C++) extracts PDF text much faster than pure-Python PyPDF2
+try:
+    import pypdfium2 as pdfium
+except ImportError:
+    pdfium = None
+
+
+class _CleanTable(dict):
+    """
+    str.translate table that blanks every character except Tamil,
+    whitespace, digits and basic punctuation. Entries are filled on first
+    lookup, so the table only ever holds codepoints that were seen.
+    """
+    
+    _PUNCTUATION = frozenset('.,?!%$-()[]:;\'"')
+    
+    def __missing__(self, codepoint: int) -> int:
+        char = chr(codepoint)
+        keep = (
+            0x0B80 <= codepoint <= 0x0BFF
+            or char.isspace()
+            or char.isdecimal()
+            or char in self._PUNCTUATION
+        )
+        value = codepoint if keep else ord(' ')
+        self[codepoint] = value
+        return value
+
+
+# Shared by all processors so the lazily built table is reused
+_CLEAN_TABLE = _CleanTable()
+
+# Bounds for the in-memory extract/clean/chunk results of process_file
+PIPELINE_CACHE_ENTRIES = 64
+PIPELINE_CACHE_CHARS = 20_000_000
+
+# Numba JIT-compiles the Tamil character scan; NumPy vectorization otherwise
+try:
+    from numba import njit, prange
+except ImportError:
+    njit = None
+
+if njit is not None:
+    @njit(cache=True, parallel=True, boundscheck=False)
+    def _count_tamil_chars(codepoints):
+        """Count codepoints in the Tamil block"""
+        count = 0
+        for i in prange(codepoints.size):
+            c = codepoints[i]
+            if 0x0B80 <= c <= 0x0BFF:
+                count += 1
+        return count
+else:
+    def _count_tamil_chars(codepoints):
+        """Count codepoints in the Tamil block"""
+        return int(((codepoints >= 0x0B80) & (codepoints <= 0x0BFF)).sum())
+
 class TamilDocumentProcessor:
     """Process Tamil documents for the knowledge base"""
     
-    def __init__(self, documents_dir: str):
+    def __init__(self, documents_dir: str, cache_dir: Optional[str] = None):
         """
         Initialize document processor
         
         Args:
             documents_dir: Directory containing Tamil documents
+            cache_dir: Directory for cached extracted text
+                (defaults to .textcache next to documents_dir)
         """
         self.documents_dir = Path(documents_dir)
         self.supported_extensions = ['.txt', '.pdf', '.docx', '.md']
         
-        # Tamil-specific text cleaning patterns
-        self.tamil_patterns = {
-            'extra_spaces': r'\s+',
-            'multiple_newlines': r'\n\s*\n\s*\n+',
-            'special_chars': r'[^\u0B80-\u0BFF\s\.\,\?\!\%\$\-\(\)\[\]\:;\'\"\d]'
-        }
+        # Extracted text cache, keyed by path and validated by mtime/size
+        if cache_dir is None:
+            cache_dir = self.documents_dir.parent / ".textcache"
+        self.cache_dir = Path(cache_dir)
+        
+        # Tamil-specific text cleaning table and patterns (compiled once)
+        self._clean_table = _CLEAN_TABLE
+        self._re_spaces = re.compile(r'\s+')
+        self._re_newlines = re.compile(r'\n\s*\n\s*\n+')
+        
+        # Pipeline results keyed by (path, mtime_ns, size), LRU-bounded by
+        # entry count and total characters held
+        self._pipeline_cache = OrderedDict()
+        self._pipeline_cache_chars = 0
+    
+    def __getstate__(self):
+        """Leave the pipeline cache behind when pickled for worker processes"""
+        state = self.__dict__.copy()
+        state['_pipeline_cache'] = OrderedDict()
+        state['_pipeline_cache_chars'] = 0
+        return state
     
     def list_documents(self) -> List[Dict[str, Any]]:
         """
@@ -39,14 +119,26 @@ class TamilDocumentProcessor:
             List of document information dictionaries
         """
         documents = []
+        extensions = set(self.supported_extensions)
+        
+        # A missing directory just has no documents
+        if not self.documents_dir.is_dir():
+            return documents
         
-        for ext in self.supported_extensions:
-            for file_path in self.documents_dir.glob(f"*{ext}"):
+        # Single directory pass; scandir entries cache their stat result
+        with os.scandir(self.documents_dir) as entries:
+            for entry in entries:
+                ext = os.path.splitext(entry.name)[1].lower()
+                if ext not in extensions or not entry.is_file():
+                    continue
+                
+                st = entry.stat()
                 doc_info = {
-                    'name': file_path.name,
-                    'path': str(file_path),
-                    'size': file_path.stat().st_size,
-                    'modified': file_path.stat().st_mtime,
+                    'name': entry.name,
+                    'path': entry.path,
+                    'size': st.st_size,
+                    'modified': st.st_mtime,
+                    'mtime_ns': st.st_mtime_ns,
                     'extension': ext
                 }
                 documents.append(doc_info)
@@ -69,15 +161,20 @@ class TamilDocumentProcessor:
         path = Path(file_path)
         extension = path.suffix.lower()
         
+        # Reuse the cached text while the file is unchanged
+        cached_text = self._read_text_cache(path)
+        if cached_text is not None:
+            return cached_text
+        
         try:
             if extension == '.txt':
-                return self._read_text_file(path)
+                text = self._read_text_file(path)
             elif extension == '.pdf':
-                return self._read_pdf_file(path)
+                text = self._read_pdf_file(path)
             elif extension == '.docx':
-                return self._read_docx_file(path)
+                text = self._read_docx_file(path)
             elif extension == '.md':
-                return self._read_text_file(path)
+                text = self._read_text_file(path)
             else:
                 print(f"⚠️ ஆதரவில்லாத கோப்பு வகை: {extension}")
                 return ""
@@ -85,36 +182,117 @@ class TamilDocumentProcessor:
         except Exception as e:
             print(f"❌ ஆவணத்தை படிக்க முடியவில்லை {path.name}: {e}")
             return ""
+        
+        if text:
+            self._write_text_cache(path, text)
+        
+        return text
     
-    def _read_text_file(self, path: Path) -> str:
-        """Read text file with UTF-8 encoding"""
+    def _text_cache_paths(self, path: Path):
+        """Return (text_file, meta_file, signature) for a document"""
+        st = path.stat()
+        key = hashlib.sha1(str(path.resolve()).encode('utf-8')).hexdigest()
+        signature = f"{st.st_mtime_ns},{st.st_size}"
+        return self.cache_dir / f"{key}.txt", self.cache_dir / f"{key}.meta", signature
+    
+    def _read_text_cache(self, path: Path) -> Optional[str]:
+        """Read cached extracted text, None if missing or stale"""
         try:
-            with open(path, 'r', encoding='utf-8') as f:
-                return f.read()
-        except UnicodeDecodeError:
-            # Try with different encodings
-            encodings = ['utf-8-sig', 'latin-1', 'cp1252']
-            for encoding in encodings:
+            text_file, meta_file, signature = self._text_cache_paths(path)
+            if meta_file.exists() and meta_file.read_text() == signature:
+                return text_file.read_text(encoding='utf-8')
+        except OSError:
+            pass
+        return None
+    
+    def _write_text_cache(self, path: Path, text: str):
+        """Cache extracted text (best effort)"""
+        try:
+            text_file, meta_file, signature = self._text_cache_paths(path)
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            text_file.write_text(text, encoding='utf-8')
+            # Written last so a partial write is never treated as valid
+            meta_file.write_text(signature)
+        except OSError as e:
+            print(f"⚠️ உரை கேச் சேமிக்க முடியவில்லை: {e}")
+    
+    def extract_text_bulk(self, paths: List[str]) -> List[str]:
+        """
+        Extract text from many documents in parallel worker processes
+        
+        Args:
+            paths: Paths to document files
+            
+        Returns:
+            Extracted texts, in the same order as paths
+        """
+        # Cache hits are cheap reads; only misses are worth a worker process
+        texts = [self._read_text_cache(Path(path)) for path in paths]
+        misses = [i for i, text in enumerate(texts) if text is None]
+        
+        if len(misses) <= 1:
+            for i in misses:
+                texts[i] = self.extract_text(paths[i])
+            return texts
+        
+        # PDF/DOCX parsing is pure Python, so processes (not threads) scale.
+        # Spawn rather than fork: the caller may already be running threads.
+        max_workers = min(len(misses), os.cpu_count() or 1)
+        with ProcessPoolExecutor(max_workers=max_workers,
+                                 mp_context=multiprocessing.get_context("spawn")) as executor:
+            extracted = executor.map(self.extract_text, [paths[i] for i in misses], chunksize=4)
+            for i, text in zip(misses, extracted):
+                texts[i] = text
+        return texts
+    
+    def _read_text_file(self, path: Path) -> str:
+        """Read text file, decoding straight from a memory map"""
+        # mmap cannot map an empty file
+        if path.stat().st_size == 0:
+            return ""
+        
+        with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            text = None
+            # Try UTF-8 first, then different encodings
+            for encoding in ['utf-8', 'utf-8-sig', 'latin-1', 'cp1252']:
                 try:
-                    with open(path, 'r', encoding=encoding) as f:
-                        return f.read()
-                except:
+                    text = str(mm, encoding)
+                    break
+                except UnicodeDecodeError:
                     continue
+        
+        if text is None:
             return ""
+        
+        # Match the newline translation of text-mode reads
+        if '\r' in text:
+            text = text.replace('\r\n', '\n').replace('\r', '\n')
+        
+        return text
     
     def _read_pdf_file(self, path: Path) -> str:
         """Extract text from PDF file"""
-        text = ""
+        parts = []
         try:
-            with open(path, 'rb') as file:
-                pdf_reader = PyPDF2.PdfReader(file)
-                for page_num in range(len(pdf_reader.pages)):
-                    page = pdf_reader.pages[page_num]
-                    text += page.extract_text() + "\n"
+            if pdfium is not None:
+                pdf = pdfium.PdfDocument(str(path))
+                try:
+                    for page in pdf:
+                        textpage = page.get_textpage()
+                        parts.append(textpage.get_text_range())
+                        textpage.close()
+                        page.close()
+                finally:
+                    pdf.close()
+            else:
+                with open(path, 'rb') as file:
+                    pdf_reader = PyPDF2.PdfReader(file)
+                    for page in pdf_reader.pages:
+                        parts.append(page.extract_text())
         except Exception as e:
             print(f"❌ PDF பிழை: {e}")
         
-        return text
+        return "\n".join(parts)
     
     def _read_docx_file(self, path: Path) -> str:
         """Extract text from DOCX file"""
@@ -140,13 +318,13 @@ class TamilDocumentProcessor:
             return ""
         
         # Remove special characters (keep Tamil and basic punctuation)
-        text = re.sub(self.tamil_patterns['special_chars'], ' ', text)
+        text = text.translate(self._clean_table)
         
         # Normalize whitespace
-        text = re.sub(self.tamil_patterns['extra_spaces'], ' ', text)
+        text = self._re_spaces.sub(' ', text)
         
         # Normalize newlines
-        text = re.sub(self.tamil_patterns['multiple_newlines'], '\n\n', text)
+        text = self._re_newlines.sub('\n\n', text)
         
         # Remove leading/trailing whitespace
         text = text.strip()
@@ -154,7 +332,7 @@ class TamilDocumentProcessor:
         return text
     
     def split_into_chunks(self, text: str, chunk_size: int = 1000, 
-                         overlap: int = 200) -> List[str]:
+                         overlap: int = 200, already_cleaned: bool = False) -> List[str]:
         """
         Split Tamil text into chunks for processing
         
@@ -162,44 +340,135 @@ class TamilDocumentProcessor:
             text: Tamil text to split
             chunk_size: Maximum chunk size in characters
             overlap: Overlap between chunks
+            already_cleaned: Whether text already went through clean_tamil_text
             
         Returns:
             List of text chunks
         """
+        return list(self.iter_chunks(text, chunk_size, overlap, already_cleaned))
+    
+    def iter_chunks(self, text: str, chunk_size: int = 1000, overlap: int = 200,
+                    already_cleaned: bool = False) -> Iterator[str]:
+        """
+        Lazily yield the chunks of split_into_chunks, one slice at a time
+        
+        Args:
+            text: Tamil text to split
+            chunk_size: Maximum chunk size in characters
+            overlap: Overlap between chunks
+            already_cleaned: Whether text already went through clean_tamil_text
+            
+        Yields:
+            Text chunks
+        """
         if not text:
-            return []
+            return
         
         # Clean text first
-        text = self.clean_tamil_text(text)
+        if not already_cleaned:
+            text = self.clean_tamil_text(text)
+        
+        for start, end in self._chunk_offsets(text, chunk_size, overlap):
+            yield text[start:end]
+    
+    def _chunk_offsets(self, text: str, chunk_size: int = 1000,
+                       overlap: int = 200) -> List[Tuple[int, int]]:
+        """
+        Compute chunk boundaries without copying any text
         
-        chunks = []
+        Args:
+            text: Cleaned Tamil text
+            chunk_size: Maximum chunk size in characters
+            overlap: Overlap between chunks
+            
+        Returns:
+            List of (start, end) offsets of non-empty, stripped chunks
+        """
+        offsets = []
         start = 0
         text_length = len(text)
         
+        # Locate every candidate break point in one vectorized pass; indices
+        # into the UTF-32 codepoint array match str indices
+        codepoints = np.frombuffer(text.encode('utf-32-le'), dtype=np.uint32)
+        periods = np.flatnonzero(codepoints == ord('.'))
+        newlines = np.flatnonzero(codepoints == ord('\n'))
+        
         while start < text_length:
             # Calculate end position
             end = start + chunk_size
             
             # If we're not at the end, try to find a good breaking point
             if end < text_length:
-                # Try to break at sentence end
-                sentence_end = text.rfind('.', start, end)
-                paragraph_end = text.rfind('\n', start, end)
+                # Last period / newline before end (same as str.rfind)
+                i = np.searchsorted(periods, end) - 1
+                sentence_end = int(periods[i]) if i >= 0 else -1
+                i = np.searchsorted(newlines, end) - 1
+                paragraph_end = int(newlines[i]) if i >= 0 else -1
                 
+                # Try to break at sentence end
                 if sentence_end > start and (end - sentence_end) < 100:
                     end = sentence_end + 1
                 elif paragraph_end > start and (end - paragraph_end) < 50:
                     end = paragraph_end + 1
             
-            # Extract chunk
-            chunk = text[start:end].strip()
-            if chunk:  # Only add non-empty chunks
-                chunks.append(chunk)
+            # Strip surrounding whitespace from the chunk's offsets
+            chunk_start, chunk_end = start, min(end, text_length)
+            while chunk_start < chunk_end and text[chunk_start].isspace():
+                chunk_start += 1
+            while chunk_end > chunk_start and text[chunk_end - 1].isspace():
+                chunk_end -= 1
+            
+            if chunk_start < chunk_end:  # Only add non-empty chunks
+                offsets.append((chunk_start, chunk_end))
             
             # Move start position (with overlap)
             start = end - overlap if (end - overlap) > start else end
         
-        return chunks
+        return offsets
+    
+    def process_file(self, file_path: str) -> Tuple[str, str, List[Tuple[int, int]]]:
+        """
+        Run the extract -> clean -> chunk pipeline, memoized per file version
+        
+        Args:
+            file_path: Path to document file
+            
+        Returns:
+            Tuple of (text, cleaned_text, chunk_offsets)
+        """
+        try:
+            st = os.stat(file_path)
+        except OSError:
+            # Let extract_text report the missing file
+            return self._run_pipeline(file_path)
+        
+        key = (str(file_path), st.st_mtime_ns, st.st_size)
+        cache = self._pipeline_cache
+        result = cache.get(key)
+        if result is not None:
+            cache.move_to_end(key)
+            return result
+        
+        result = self._run_pipeline(str(file_path))
+        cache[key] = result
+        self._pipeline_cache_chars += len(result[0]) + len(result[1])
+        
+        # Evict least recently used entries (older versions of a file age out too)
+        while cache and (len(cache) > PIPELINE_CACHE_ENTRIES
+                         or self._pipeline_cache_chars > PIPELINE_CACHE_CHARS):
+            _, (text, cleaned_text, _) = cache.popitem(last=False)
+            self._pipeline_cache_chars -= len(text) + len(cleaned_text)
+        
+        return result
+    
+    def _run_pipeline(self, file_path: str) -> Tuple[str, str, List[Tuple[int, int]]]:
+        """Extract, clean and chunk a document"""
+        text = self.extract_text(file_path)
+        cleaned_text = self.clean_tamil_text(text)
+        # Offsets are enough for analysis; chunk text is never materialized
+        chunk_offsets = self._chunk_offsets(cleaned_text)
+        return text, cleaned_text, chunk_offsets
     
     def analyze_document(self, file_path: str) -> Dict[str, Any]:
         """
@@ -211,17 +480,41 @@ class TamilDocumentProcessor:
         Returns:
             Document analysis information
         """
-        text = self.extract_text(file_path)
-        cleaned_text = self.clean_tamil_text(text)
-        chunks = self.split_into_chunks(cleaned_text)
+        text, cleaned_text, chunk_offsets = self.process_file(file_path)
+        return self._analysis_dict(file_path, text, cleaned_text, chunk_offsets)
+    
+    def analyze_all(self) -> List[Dict[str, Any]]:
+        """
+        Analyze every document, extracting them all in one parallel batch
+        
+        Returns:
+            List of document analysis information
+        """
+        paths = [doc_info['path'] for doc_info in self.list_documents()]
+        texts = self.extract_text_bulk(paths)
+        
+        analyses = []
+        for path, text in zip(paths, texts):
+            cleaned_text = self.clean_tamil_text(text)
+            chunk_offsets = self._chunk_offsets(cleaned_text)
+            analyses.append(self._analysis_dict(path, text, cleaned_text, chunk_offsets))
+        
+        return analyses
+    
+    def _analysis_dict(self, file_path: str, text: str, cleaned_text: str,
+                       chunk_offsets: List[Tuple[int, int]]) -> Dict[str, Any]:
+        """Build the analysis information for an already processed document"""
+        # Count Tamil characters in one compiled pass over the codepoints
+        codepoints = np.frombuffer(cleaned_text.encode('utf-32-le'), dtype=np.uint32)
+        tamil_char_count = int(_count_tamil_chars(codepoints))
         
         # Basic analysis
         analysis = {
             'file_name': Path(file_path).name,
             'original_size': len(text),
             'cleaned_size': len(cleaned_text),
-            'chunk_count': len(chunks),
-            'tamil_char_count': sum(1 for c in cleaned_text if '\u0B80' <= c <= '\u0BFF'),
+            'chunk_count': len(chunk_offsets),
+            'tamil_char_count': tamil_char_count,
             'word_count': len(cleaned_text.split()),
             'sample_text': cleaned_text[:200] + "..." if len(cleaned_text) > 200 else cleaned_text
         }
@@ -5,15 +5,36 @@
 """
 
 import os
-import json
+import hashlib
+import sqlite3
+from contextlib import closing
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from datetime import datetime
+import numpy as np
 from langchain.text_splitter import RecursiveCharacterTextSplitter
 from langchain.embeddings import HuggingFaceEmbeddings
 from langchain.vectorstores import Chroma
 from langchain.docstore.document import Document as LangchainDocument
 
+from .utils import json_dumps, json_loads
+
+# HNSW index settings, applied when the collection is created. Embeddings are
+# unit-normalized, so inner product equals cosine without a per-query normalize
+HNSW_METADATA = {
+    "hnsw:space": "ip",
+    "hnsw:M": 16,
+    "hnsw:construction_ef": 200,
+    "hnsw:search_ef": 50
+}
+
+# Cached embeddings are stored as float16; every vector sent to the index
+# goes through the same round trip, so a chunk's vector never depends on
+# whether it came from the model or the cache
+_CACHE_DTYPE = np.float16
+
+
 class TamilKnowledgeBase:
     """Knowledge base for Tamil documents using vector embeddings"""
     
@@ -36,17 +57,43 @@ class TamilKnowledgeBase:
         
         # Metadata
         self.metadata_file = self.persist_dir / "metadata.json"
+        self.manifest_file = self.persist_dir / "manifest.json"
         self.metadata = self.load_metadata()
         
+        # Content-addressed embedding cache: unchanged chunks are never re-encoded.
+        # Vectors are stored as float16 (768 B instead of 1536 B per chunk)
+        self.embed_cache_path = self.persist_dir / "emb_cache.sqlite"
+        
+        # Query text -> embedding, so callers and search share one encode.
+        # Search results are cached by the assistant, not here
+        self._embed_cached = lru_cache(maxsize=256)(self._embed_uncached)
+        
         # Initialize embedding model
         self._init_embeddings()
         
     def _init_embeddings(self):
         """Initialize multilingual embedding model"""
+        model_name = "sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2"
+        
+        # Prefer the INT8-quantized ONNX model; fall back to PyTorch
+        try:
+            from .onnx_embeddings import ONNXInt8Embeddings
+            print("🔧 ONNX INT8 பதிவிறக்கும் மாதிரி...")
+            self.embeddings = ONNXInt8Embeddings(
+                model_name=model_name,
+                cache_dir=self.persist_dir.parent / "onnx_models"
+            )
+            print("✅ பதிவிறக்கும் மாதிரி தயார் (ONNX INT8)")
+            return
+        except ImportError:
+            pass
+        except Exception as e:
+            print(f"⚠️ ONNX மாதிரி கிடைக்கவில்லை, PyTorch பயன்படுத்தப்படுகிறது: {e}")
+        
         try:
             print("🔧 பதிவிறக்கும் பதிப்பு மாதிரி...")
             self.embeddings = HuggingFaceEmbeddings(
-                model_name="sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2",
+                model_name=model_name,
                 model_kwargs={'device': 'cpu'},
                 encode_kwargs={'normalize_embeddings': True}
             )
@@ -59,8 +106,8 @@ class TamilKnowledgeBase:
         """Load knowledge base metadata"""
         if self.metadata_file.exists():
             try:
-                with open(self.metadata_file, 'r', encoding='utf-8') as f:
-                    return json.load(f)
+                with open(self.metadata_file, 'rb') as f:
+                    return json_loads(f.read())
             except:
                 pass
         return {
@@ -73,25 +120,46 @@ class TamilKnowledgeBase:
     
     def save_metadata(self):
         """Save knowledge base metadata"""
-        with open(self.metadata_file, 'w', encoding='utf-8') as f:
-            json.dump(self.metadata, f, ensure_ascii=False, indent=2)
+        with open(self.metadata_file, 'wb') as f:
+            f.write(json_dumps(self.metadata))
     
     def create_text_splitter(self):
-        """Create text splitter optimized for Tamil"""
-        self.text_splitter = RecursiveCharacterTextSplitter(
-            chunk_size=800,
-            chunk_overlap=150,
-            length_function=len,
-            separators=[
-                "\n\n",
-                "\n",
-                "।",  # Tamil full stop
-                ".",
-                ",",
-                " ",
-                ""
-            ]
-        )
+        """
+        Create text splitter optimized for Tamil
+        
+        Chunks are measured in embedding-model tokens and sized to the
+        model's context window, so nothing is truncated or padded away.
+        Falls back to character lengths if the tokenizer is unavailable.
+        """
+        separators = [
+            "\n\n",
+            "\n",
+            "।",  # Tamil full stop
+            ".",
+            ",",
+            " ",
+            ""
+        ]
+        
+        client = getattr(self.embeddings, 'client', None)
+        tokenizer = getattr(client, 'tokenizer', None)
+        
+        if tokenizer is not None:
+            # Leave room for the [CLS]/[SEP] special tokens
+            chunk_size = client.max_seq_length - 2
+            self.text_splitter = RecursiveCharacterTextSplitter(
+                chunk_size=chunk_size,
+                chunk_overlap=chunk_size // 12,
+                length_function=lambda text: len(tokenizer.encode(text, add_special_tokens=False)),
+                separators=separators
+            )
+        else:
+            self.text_splitter = RecursiveCharacterTextSplitter(
+                chunk_size=1400,
+                chunk_overlap=120,
+                length_function=len,
+                separators=separators
+            )
     
     def process_documents(self) -> List[LangchainDocument]:
         """
@@ -113,59 +181,94 @@ class TamilKnowledgeBase:
         
         all_chunks = []
         
-        for doc_info in all_documents:
-            print(f"  • {doc_info['name']}...")
-            
-            # Extract text
-            text = processor.extract_text(doc_info['path'])
-            if not text:
-                print(f"    ⚠️ வெற்று உரை, தவிர்க்கப்பட்டது")
-                continue
-            
-            # Clean Tamil text
-            cleaned_text = processor.clean_tamil_text(text)
-            
-            # Split into chunks
-            if self.text_splitter is None:
-                self.create_text_splitter()
-            
-            chunks = self.text_splitter.split_text(cleaned_text)
-            
-            # Create Langchain documents with metadata
-            for i, chunk in enumerate(chunks):
-                langchain_doc = LangchainDocument(
-                    page_content=chunk,
-                    metadata={
-                        'source': doc_info['name'],
-                        'source_path': doc_info['path'],
-                        'chunk_index': i,
-                        'total_chunks': len(chunks),
-                        'language': 'ta',
-                        'processed_at': datetime.now().isoformat()
-                    }
-                )
-                all_chunks.append(langchain_doc)
-            
-            print(f"    ✅ {len(chunks)} பகுதி(கள்) உருவாக்கப்பட்டது")
+        texts = processor.extract_text_bulk([doc_info['path'] for doc_info in all_documents])
+        
+        for doc_info, text in zip(all_documents, texts):
+            all_chunks.extend(self._chunk_document(processor, doc_info, text))
         
         print(f"📊 மொத்தம் {len(all_chunks)} பகுதி(கள்) உருவாக்கப்பட்டது")
         return all_chunks
     
-    def build_knowledge_base(self, force_rebuild: bool = False):
+    def _chunk_document(self, processor, doc_info: Dict[str, Any],
+                        text: str) -> List[LangchainDocument]:
+        """
+        Clean and split a single extracted document into chunks
+        
+        Args:
+            processor: TamilDocumentProcessor instance
+            doc_info: Document information from list_documents()
+            text: Text extracted from the document
+            
+        Returns:
+            List of document chunks
+        """
+        print(f"  • {doc_info['name']}...")
+        
+        if not text:
+            print(f"    ⚠️ வெற்று உரை, தவிர்க்கப்பட்டது")
+            return []
+        
+        # Clean Tamil text
+        cleaned_text = processor.clean_tamil_text(text)
+        
+        # Split into chunks
+        if self.text_splitter is None:
+            self.create_text_splitter()
+        
+        chunks = self.text_splitter.split_text(cleaned_text)
+        
+        # Version chunks by file modification time so re-adding is idempotent
+        # (nanoseconds, matching the manifest)
+        version = Path(doc_info['path']).stat().st_mtime_ns
+        
+        # Create Langchain documents with metadata
+        documents = [
+            LangchainDocument(
+                page_content=chunk,
+                metadata={
+                    'source': doc_info['name'],
+                    'source_path': doc_info['path'],
+                    'chunk_index': i,
+                    'total_chunks': len(chunks),
+                    'version': version,
+                    'language': 'ta',
+                    'processed_at': datetime.now().isoformat()
+                }
+            )
+            for i, chunk in enumerate(chunks)
+        ]
+        
+        print(f"    ✅ {len(chunks)} பகுதி(கள்) உருவாக்கப்பட்டது")
+        return documents
+    
+    def build_knowledge_base(self, force_rebuild: bool = False, paths: Optional[List[str]] = None):
         """
         Build or rebuild the knowledge base
         
         Args:
             force_rebuild: Whether to force rebuild existing knowledge base
+            paths: Documents to re-index when loading an existing knowledge
+                base (see changed_documents)
         """
+        # An index built before the manifest has random chunk ids and no
+        # 'version' metadata, so incremental updates can't replace its chunks
+        if not force_rebuild and self.is_knowledge_base_exists() and not self.manifest_file.exists():
+            print("🔄 பழைய அறிவுத் தளம் கண்டறியப்பட்டது, முழுமையாக மீண்டும் உருவாக்குகிறது...")
+            force_rebuild = True
+        
         # Check if knowledge base already exists
         if not force_rebuild and self.is_knowledge_base_exists():
             print("📚 ஏற்கனவே உள்ள அறிவுத் தளத்தை ஏற்றுகிறது...")
             self.load_existing_knowledge_base()
+            if paths:
+                self.add_documents(paths)
             return
         
         print("🏗️ புதிய அறிவுத் தளத்தை உருவாக்குகிறது...")
         
+        # Snapshot the manifest before reading, so later edits still show as changed
+        manifest = self.scan_manifest()
+        
         # Process documents
         documents = self.process_documents()
         
@@ -173,50 +276,310 @@ class TamilKnowledgeBase:
             print("❌ அறிவுத் தளத்தை உருவாக்க ஆவணங்கள் இல்லை")
             return
         
-        # Create vector store
+        # Create vector store, starting from an empty collection
         print("🔢 திசையன் தளத்தை உருவாக்குகிறது...")
-        self.vectorstore = Chroma.from_documents(
-            documents=documents,
-            embedding=self.embeddings,
-            persist_directory=str(self.persist_dir)
-        )
+        self._open_vectorstore().delete_collection()
+        self.vectorstore = self._open_vectorstore()
+        
+        # Embed and insert in batches with deterministic ids, keeping
+        # peak memory bounded on large corpora
+        for start in range(0, len(documents), 500):
+            batch = documents[start:start + 500]
+            texts = [doc.page_content for doc in batch]
+            self.vectorstore._collection.add(
+                ids=[self._chunk_id(doc) for doc in batch],
+                embeddings=self._encode(texts),
+                documents=texts,
+                metadatas=[doc.metadata for doc in batch]
+            )
         
         # Persist the database
         self.vectorstore.persist()
         
         # Update metadata
-        self.metadata['last_updated'] = datetime.now().isoformat()
-        self.metadata['document_count'] = len(set(doc.metadata['source'] for doc in documents))
-        self.metadata['chunk_count'] = len(documents)
-        self.metadata['documents'] = [
-            {
-                'name': doc.metadata['source'],
-                'chunks': doc.metadata['total_chunks'],
-                'added_at': doc.metadata['processed_at']
-            }
-            for doc in documents if doc.metadata.get('chunk_index', 0) == 0
-        ]
-        
-        self.save_metadata()
+        self.metadata['documents'] = []
+        self._update_metadata(documents)
+        self._save_manifest(manifest)
         
         print(f"✅ அறிவுத் தளம் உருவாக்கப்பட்டது:")
         print(f"   • ஆவணங்கள்: {self.metadata['document_count']}")
         print(f"   • பகுதிகள்: {self.metadata['chunk_count']}")
         print(f"   • இடம்: {self.persist_dir}")
     
+    def _open_vectorstore(self) -> Chroma:
+        """Open (or create) the persisted Chroma collection"""
+        return Chroma(
+            persist_directory=str(self.persist_dir),
+            embedding_function=self.embeddings,
+            collection_metadata=HNSW_METADATA
+        )
+    
     def load_existing_knowledge_base(self):
         """Load existing knowledge base from disk"""
         try:
-            self.vectorstore = Chroma(
-                persist_directory=str(self.persist_dir),
-                embedding_function=self.embeddings
-            )
+            self.vectorstore = self._open_vectorstore()
             print("✅ அறிவுத் தளம் ஏற்றப்பட்டது")
         except Exception as e:
             print(f"❌ அறிவுத் தளத்தை ஏற்ற முடியவில்லை: {e}")
             print("🔄 மீண்டும் உருவாக்க முயற்சிக்கிறது...")
             self.build_knowledge_base(force_rebuild=True)
     
+    def add_documents(self, paths: List[str], batch_size: int = 100):
+        """
+        Add new or updated documents without rebuilding the whole knowledge base
+        
+        Args:
+            paths: Paths of the documents to add
+            batch_size: Number of chunks sent to Chroma per upsert() call
+        """
+        from src.document_processor import TamilDocumentProcessor
+        
+        if not (self.is_knowledge_base_exists() and self.manifest_file.exists()):
+            # Nothing indexed yet (or indexed before the manifest), a full
+            # build picks up the new files too
+            self.build_knowledge_base(force_rebuild=True)
+            return
+        
+        if self.vectorstore is None:
+            self.load_existing_knowledge_base()
+        
+        processor = TamilDocumentProcessor(str(self.documents_dir))
+        manifest = self.load_manifest()
+        
+        print(f"📄 {len(paths)} புதிய ஆவண(ங்கள்) செயலாக்கப்படுகின்றன...")
+        
+        doc_infos = []
+        removed = []
+        for path in paths:
+            path = Path(path)
+            try:
+                st = path.stat()
+            except FileNotFoundError:
+                # Deleted since it was indexed; drop its chunks
+                print(f"  ⚠️ கோப்பு கிடைக்கவில்லை: {path.name}")
+                removed.append(path.name)
+                continue
+            
+            doc_infos.append({'name': path.name, 'path': str(path)})
+            manifest[path.name] = [st.st_mtime_ns, st.st_size]
+        
+        texts = processor.extract_text_bulk([doc_info['path'] for doc_info in doc_infos])
+        
+        documents = []
+        emptied = []
+        for doc_info, text in zip(doc_infos, texts):
+            chunks = self._chunk_document(processor, doc_info, text)
+            if not chunks:
+                # Now extracts to nothing; its old chunks must not linger
+                emptied.append(doc_info['name'])
+            documents.extend(chunks)
+        
+        for name in removed:
+            manifest.pop(name, None)
+        
+        # Deleted and emptied files both lose every chunk they had
+        removed = removed + emptied
+        if removed:
+            self._remove_documents(removed)
+        
+        if documents:
+            self._upsert_documents(documents, batch_size=batch_size)
+        
+        self.vectorstore.persist()
+        self._update_metadata(documents, removed=removed)
+        self._save_manifest(manifest)
+        
+        print(f"✅ {len(documents)} பகுதி(கள்) சேர்க்கப்பட்டது")
+    
+    def _remove_documents(self, names: List[str]):
+        """
+        Delete every chunk of the given documents from the vector store
+        
+        Args:
+            names: Document file names (the 'source' metadata)
+        """
+        for name in names:
+            self.vectorstore._collection.delete(where={'source': name})
+    
+    def scan_manifest(self) -> Dict[str, List[int]]:
+        """
+        Stat every document in the documents directory
+        
+        Returns:
+            Mapping of file name to [mtime_ns, size]
+        """
+        from src.document_processor import TamilDocumentProcessor
+        
+        processor = TamilDocumentProcessor(str(self.documents_dir))
+        return {
+            doc_info['name']: [doc_info['mtime_ns'], doc_info['size']]
+            for doc_info in processor.list_documents()
+        }
+    
+    def load_manifest(self) -> Dict[str, List[int]]:
+        """Load the manifest of the last indexed document versions"""
+        try:
+            with open(self.manifest_file, 'rb') as f:
+                return json_loads(f.read())
+        except (OSError, ValueError):
+            return {}
+    
+    def _save_manifest(self, manifest: Dict[str, List[int]]):
+        """Save the manifest of indexed document versions"""
+        with open(self.manifest_file, 'wb') as f:
+            f.write(json_dumps(manifest))
+    
+    def changed_documents(self) -> List[str]:
+        """
+        Find documents added, modified or deleted since they were last indexed
+        
+        Returns:
+            Paths of changed documents (deleted ones no longer exist)
+        """
+        current = self.scan_manifest()
+        previous = self.load_manifest()
+        
+        names = sorted(
+            name for name in current.keys() | previous.keys()
+            if current.get(name) != previous.get(name)
+        )
+        return [str(self.documents_dir / name) for name in names]
+    
+    def index_document(self, path: str):
+        """
+        Index a single new or updated document
+        
+        Args:
+            path: Path of the document
+        """
+        self.add_documents([path])
+    
+    @staticmethod
+    def _chunk_id(doc: LangchainDocument) -> str:
+        """Deterministic vector id for a chunk"""
+        meta = doc.metadata
+        return f"{meta['source']}:{meta['version']}:{meta['chunk_index']}"
+    
+    def _encode(self, texts: List[str]) -> List[List[float]]:
+        """
+        Embed chunk texts, reusing cached vectors for chunks seen before
+        
+        Args:
+            texts: Chunk texts
+            
+        Returns:
+            One embedding per text
+        """
+        if not texts:
+            return []
+        
+        # Backend is part of the key: ONNX INT8 vectors differ slightly from PyTorch
+        model_name = f"{self.embeddings.model_name}:{type(self.embeddings).__name__}"
+        keys = [
+            hashlib.sha256((model_name + "\0" + text).encode('utf-8')).hexdigest()
+            for text in texts
+        ]
+        
+        with closing(sqlite3.connect(self.embed_cache_path)) as conn:
+            # emb_cache held int8 vectors; they can't reproduce float16 ones
+            conn.execute("DROP TABLE IF EXISTS emb_cache")
+            conn.execute("CREATE TABLE IF NOT EXISTS emb_cache_f16 (hash TEXT PRIMARY KEY, vec BLOB)")
+            
+            # Look up in slices that stay under SQLite's bound-parameter limit
+            cached = {}
+            for start in range(0, len(keys), 900):
+                part = keys[start:start + 900]
+                placeholders = ",".join("?" * len(part))
+                cached.update(conn.execute(
+                    f"SELECT hash, vec FROM emb_cache_f16 WHERE hash IN ({placeholders})", part
+                ))
+            
+            # Batch-encode only the misses
+            misses = [i for i, key in enumerate(keys) if key not in cached]
+            if misses:
+                vectors = self.embeddings.client.encode(
+                    [texts[i] for i in misses],
+                    batch_size=64,
+                    show_progress_bar=False,
+                    convert_to_numpy=True,
+                    normalize_embeddings=True
+                )
+                rows = [
+                    (keys[i], vec.tobytes())
+                    for i, vec in zip(misses, np.asarray(vectors, dtype=_CACHE_DTYPE))
+                ]
+                with conn:
+                    conn.executemany("INSERT OR REPLACE INTO emb_cache_f16 VALUES (?, ?)", rows)
+                cached.update(rows)
+        
+        # Fresh and cached vectors are read back from the same float16 bytes
+        stored = np.stack([np.frombuffer(cached[key], dtype=_CACHE_DTYPE) for key in keys])
+        return stored.astype(np.float32).tolist()
+    
+    def _upsert_documents(self, documents: List[LangchainDocument], batch_size: int = 100):
+        """
+        Upsert chunks into the vector store keyed by deterministic ids
+        
+        Args:
+            documents: Document chunks to store
+            batch_size: Number of chunks per upsert() call
+        """
+        collection = self.vectorstore._collection
+        
+        # Drop chunks of older versions of the same files, and chunks past the
+        # new end in case a rewrite kept the same mtime but shrank the file
+        versions = {
+            doc.metadata['source']: (doc.metadata['version'], doc.metadata['total_chunks'])
+            for doc in documents
+        }
+        for source, (version, total_chunks) in versions.items():
+            collection.delete(where={
+                '$and': [
+                    {'source': source},
+                    {'$or': [
+                        {'version': {'$ne': version}},
+                        {'chunk_index': {'$gte': total_chunks}}
+                    ]}
+                ]
+            })
+        
+        # Length-sorted batches keep encoder padding close to each batch's minimum
+        documents = sorted(documents, key=lambda doc: len(doc.page_content))
+        
+        for start in range(0, len(documents), batch_size):
+            batch = documents[start:start + batch_size]
+            texts = [doc.page_content for doc in batch]
+            collection.upsert(
+                ids=[self._chunk_id(doc) for doc in batch],
+                embeddings=self._encode(texts),
+                documents=texts,
+                metadatas=[doc.metadata for doc in batch]
+            )
+    
+    def _update_metadata(self, documents: List[LangchainDocument], removed: Optional[List[str]] = None):
+        """Merge newly indexed chunks into the knowledge base metadata"""
+        sources = {doc.metadata['source'] for doc in documents} | set(removed or [])
+        
+        entries = [
+            entry for entry in self.metadata.get('documents', [])
+            if entry['name'] not in sources
+        ]
+        entries.extend(
+            {
+                'name': doc.metadata['source'],
+                'chunks': doc.metadata['total_chunks'],
+                'added_at': doc.metadata['processed_at']
+            }
+            for doc in documents if doc.metadata.get('chunk_index', 0) == 0
+        )
+        
+        self.metadata['last_updated'] = datetime.now().isoformat()
+        self.metadata['documents'] = entries
+        self.metadata['document_count'] = len(entries)
+        self.metadata['chunk_count'] = sum(entry['chunks'] for entry in entries)
+        
+        self.save_metadata()
+    
     def is_knowledge_base_exists(self) -> bool:
         """Check if knowledge base exists"""
         # Check for Chroma index files
@@ -242,31 +605,56 @@ class TamilKnowledgeBase:
             return []
         
         try:
-            # Add Tamil context to query
-            enhanced_query = f"தமிழ் ஆவணங்கள்: {query}"
-            
-            # Perform similarity search
-            results = self.vectorstore.similarity_search_with_relevance_scores(
-                enhanced_query,
+            # Vectors are L2-normalized so a dot product is the cosine
+            query_vec = self.embed_query(query)
+            matches = self.vectorstore.similarity_search_by_vector_with_relevance_scores(
+                query_vec.tolist(),
                 k=k
             )
+            relevance = self.vectorstore._select_relevance_score_fn()
             
-            formatted_results = []
-            for doc, score in results:
-                formatted_results.append({
+            return [
+                {
                     'content': doc.page_content,
                     'source': doc.metadata.get('source', 'Unknown'),
                     'chunk': doc.metadata.get('chunk_index', 0) + 1,
-                    'score': float(score),
+                    'score': float(relevance(distance)),
                     'language': 'ta'
-                })
-            
-            return formatted_results
+                }
+                for doc, distance in matches
+            ]
             
         except Exception as e:
             print(f"❌ தேடல் பிழை: {e}")
             return []
     
+    @staticmethod
+    def _enhance_query(query: str) -> str:
+        """Add Tamil context to a search query"""
+        return f"தமிழ் ஆவணங்கள்: {query}"
+    
+    def embed_query(self, query: str) -> np.ndarray:
+        """
+        Embed a search query exactly as search() does
+        
+        The embedding is memoized, so a following search() for the same
+        query does not encode it again.
+        
+        Args:
+            query: Tamil search query
+            
+        Returns:
+            L2-normalized float32 vector (read-only)
+        """
+        return self._embed_cached(self._enhance_query(query))
+    
+    def _embed_uncached(self, text: str) -> np.ndarray:
+        """Embed text with the knowledge base's model"""
+        vec = np.asarray(self.embeddings.embed_query(text), dtype=np.float32)
+        vec = vec / max(float(np.linalg.norm(vec)), 1e-12)
+        vec.setflags(write=False)  # Shared by every caller of the cache
+        return vec
+    
     def get_stats(self) -> Dict[str, Any]:
         """Get knowledge base statistics"""
         if self.vectorstore is None:
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+ONNX Runtime INT8 பதிவிறக்கும் மாதிரி (Quantized Sentence Embeddings)
+"""
+
+from pathlib import Path
+from typing import List
+import numpy as np
+from langchain.embeddings.base import Embeddings
+from optimum.onnxruntime import ORTModelForFeatureExtraction, ORTQuantizer
+from optimum.onnxruntime.configuration import AutoQuantizationConfig
+from transformers import AutoTokenizer
+
+QUANTIZED_FILE = "model_quantized.onnx"
+
+
+class ONNXInt8Embeddings(Embeddings):
+    """Sentence embeddings from a dynamically INT8-quantized ONNX model"""
+
+    def __init__(self, model_name: str, cache_dir: str, max_seq_length: int = 128):
+        """
+        Export and quantize the model on first use, then load it
+
+        Args:
+            model_name: Hugging Face sentence-transformers model id
+            cache_dir: Directory to keep the quantized ONNX model
+            max_seq_length: Maximum tokens per text (matches the
+                sentence-transformers config of the model)
+        """
+        self.model_name = model_name
+        self.max_seq_length = max_seq_length
+        self.model_dir = Path(cache_dir) / model_name.replace("/", "__")
+
+        if not (self.model_dir / QUANTIZED_FILE).exists():
+            self._export_quantized()
+
+        self.tokenizer = AutoTokenizer.from_pretrained(self.model_dir)
+        self.model = ORTModelForFeatureExtraction.from_pretrained(
+            self.model_dir,
+            file_name=QUANTIZED_FILE,
+            provider="CPUExecutionProvider"
+        )
+
+        # Same encode() surface as SentenceTransformer, so callers can use .client
+        self.client = self
+
+    def _export_quantized(self):
+        """Export the model to ONNX and apply dynamic INT8 quantization"""
+        print("🔧 ONNX INT8 மாதிரியை உருவாக்குகிறது...")
+        self.model_dir.mkdir(parents=True, exist_ok=True)
+
+        model = ORTModelForFeatureExtraction.from_pretrained(self.model_name, export=True)
+        model.save_pretrained(self.model_dir)
+        AutoTokenizer.from_pretrained(self.model_name).save_pretrained(self.model_dir)
+
+        # Dynamic quantization: weights int8 offline, activations at runtime
+        quantizer = ORTQuantizer.from_pretrained(self.model_dir)
+        quantizer.quantize(
+            save_dir=self.model_dir,
+            quantization_config=AutoQuantizationConfig.avx512_vnni(is_static=False, per_channel=False)
+        )
+
+    def encode(self, sentences: List[str], batch_size: int = 32,
+               normalize_embeddings: bool = False, **kwargs) -> np.ndarray:
+        """
+        Encode texts with mean pooling over token embeddings
+
+        Args:
+            sentences: Texts to encode
+            batch_size: Texts per forward pass
+            normalize_embeddings: Whether to L2-normalize the vectors
+
+        Returns:
+            Array of shape (len(sentences), dim)
+        """
+        batches = []
+        for start in range(0, len(sentences), batch_size):
+            inputs = self.tokenizer(
+                sentences[start:start + batch_size],
+                padding=True,
+                truncation=True,
+                max_length=self.max_seq_length,
+                return_tensors="np"
+            )
+            hidden = self.model(**inputs).last_hidden_state
+
+            mask = inputs["attention_mask"][..., None].astype(np.float32)
+            pooled = (hidden * mask).sum(axis=1) / np.maximum(mask.sum(axis=1), 1e-9)
+            batches.append(pooled.astype(np.float32))
+
+        if not batches:
+            return np.zeros((0, self.model.config.hidden_size), dtype=np.float32)
+
+        vectors = np.concatenate(batches)
+        if normalize_embeddings:
+            vectors /= np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12)
+
+        return vectors
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        """Embed a list of documents"""
+        return self.encode(texts, batch_size=64, normalize_embeddings=True).tolist()
+
+    def embed_query(self, text: str) -> List[float]:
+        """Embed a single query"""
+        return self.encode([text], normalize_embeddings=True)[0].tolist()
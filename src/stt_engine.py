@@ -5,7 +5,8 @@
 """
 
 import os
-import tempfile
+import queue
+import threading
 import numpy as np
 from datetime import datetime
 from typing import Optional, Tuple
@@ -26,19 +27,41 @@ class TamilSTTEngine:
         self.model_name = model_name
         self.device = device
         self.model = None
+        self.backend = None  # "faster-whisper" or "whisper"
         self.sample_rate = 16000
         self.audio_cache = {}
         
     def load_model(self):
-        """Load Whisper model (lazy loading)"""
+        """Load Whisper model (lazy loading), preferring faster-whisper"""
         if self.model is None:
+            # Accept Hugging Face ids such as "openai/whisper-small"
+            model_size = self.model_name.split("/")[-1].replace("whisper-", "")
+            device = self.device or "cpu"
+            
+            try:
+                from faster_whisper import WhisperModel
+                print(f"🔧 தமிழ் STT மாதிரியை ஏற்றுகிறது: {model_size} (faster-whisper)")
+                # CTranslate2 backend: int8 GEMM on CPU, fp16 on GPU
+                self.model = WhisperModel(
+                    model_size,
+                    device=device,
+                    compute_type="int8" if device == "cpu" else "float16",
+                    cpu_threads=os.cpu_count() or 0
+                )
+                self.backend = "faster-whisper"
+                print("✅ STT மாதிரி ஏற்றப்பட்டது")
+                return self.model
+            except ImportError:
+                pass
+            
             try:
                 import whisper
-                print(f"🔧 தமிழ் STT மாதிரியை ஏற்றுகிறது: {self.model_name}")
-                self.model = whisper.load_model(self.model_name, device=self.device)
+                print(f"🔧 தமிழ் STT மாதிரியை ஏற்றுகிறது: {model_size}")
+                self.model = whisper.load_model(model_size, device=self.device)
+                self.backend = "whisper"
                 print("✅ STT மாதிரி ஏற்றப்பட்டது")
             except ImportError:
-                print("❌ whisper நூலகம் தேவை: pip install openai-whisper")
+                print("❌ whisper நூலகம் தேவை: pip install faster-whisper")
                 raise
         return self.model
     
@@ -71,6 +94,28 @@ class TamilSTTEngine:
             print(f"❌ பதிவில் பிழை: {e}")
             raise
     
+    def has_speech(self, audio_data: np.ndarray, threshold: float = 0.01,
+                   min_voiced: float = 0.1) -> bool:
+        """
+        Cheap energy gate run before Whisper
+        
+        Args:
+            audio_data: Mono float32 audio
+            threshold: Frame RMS above which a frame counts as voiced
+            min_voiced: Fraction of voiced 30 ms frames needed
+            
+        Returns:
+            True if the audio likely contains speech
+        """
+        frame = int(self.sample_rate * 0.03)
+        usable = audio_data.size - audio_data.size % frame
+        if usable == 0:
+            return False
+        
+        frames = np.asarray(audio_data[:usable], dtype=np.float32).reshape(-1, frame)
+        rms = np.sqrt(np.mean(frames * frames, axis=1))
+        return float(np.mean(rms > threshold)) >= min_voiced
+    
     def transcribe_audio(self, audio_data: np.ndarray) -> str:
         """
         Transcribe Tamil audio to text
@@ -85,24 +130,30 @@ class TamilSTTEngine:
             self.load_model()
         
         try:
-            # Save to temporary file for Whisper
-            with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as tmp:
-                tmp_path = tmp.name
-                sf.write(tmp_path, audio_data, self.sample_rate)
+            # Both backends take 16 kHz float32 samples directly, no WAV/ffmpeg round trip
+            audio = np.asarray(audio_data, dtype=np.float32)
             
             # Transcribe with Tamil language specified
-            result = self.model.transcribe(
-                tmp_path,
-                language="ta",  # Tamil language code
-                task="transcribe",
-                temperature=0.0,
-                best_of=1
-            )
-            
-            # Clean up
-            os.unlink(tmp_path)
-            
-            tamil_text = result["text"].strip()
+            if self.backend == "faster-whisper":
+                # VAD filter skips silent stretches before decoding
+                segments, _ = self.model.transcribe(
+                    audio,
+                    language="ta",  # Tamil language code
+                    task="transcribe",
+                    beam_size=1,
+                    temperature=0.0,
+                    vad_filter=True
+                )
+                tamil_text = " ".join(segment.text.strip() for segment in segments).strip()
+            else:
+                result = self.model.transcribe(
+                    audio,
+                    language="ta",  # Tamil language code
+                    task="transcribe",
+                    temperature=0.0,
+                    best_of=1
+                )
+                tamil_text = result["text"].strip()
             
             if tamil_text:
                 print(f"🎤 கேட்டது: {tamil_text}")
@@ -143,26 +194,65 @@ class TamilSTTEngine:
         chunk_duration = 0.5  # Process in 500ms chunks
         chunk_size = int(self.sample_rate * chunk_duration)
         
-        audio_buffer = []
+        # Preallocated circular buffer (4 chunks) instead of a growing list
+        self._ring = np.zeros(chunk_size * 4, dtype=np.float32)
+        self._write = 0
+        self._filled = 0
         
         def audio_callback(indata, frames, time, status):
             if status:
                 print(f"🔊 நிலை: {status}")
             
-            # Add to buffer
-            audio_buffer.extend(indata[:, 0])
+            # Add to buffer, wrapping around the end of the ring
+            capacity = len(self._ring)
+            samples = indata[-capacity:, 0]
+            n = len(samples)
+            split = min(n, capacity - self._write)
+            self._ring[self._write:self._write + split] = samples[:split]
+            self._ring[:n - split] = samples[split:]
+            self._write = (self._write + n) % capacity
+            # The oldest samples are overwritten if processing falls behind
+            self._filled = min(self._filled + n, capacity)
             
-            # Process if buffer has enough data
-            if len(audio_buffer) >= chunk_size:
-                # Extract chunk
-                chunk = np.array(audio_buffer[:chunk_size])
-                audio_buffer[:] = audio_buffer[chunk_size:]
+            # Process while buffer has enough data
+            while self._filled >= chunk_size:
+                # Extract chunk, joining the two ends only across the wrap
+                read = (self._write - self._filled) % capacity
+                if read + chunk_size <= capacity:
+                    chunk = self._ring[read:read + chunk_size].copy()
+                else:
+                    chunk = np.concatenate((self._ring[read:], self._ring[:read + chunk_size - capacity]))
+                self._filled -= chunk_size
+                
+                # Hand off to the transcription thread; under backpressure
+                # drop the oldest pending chunk to stay realtime
+                try:
+                    self._q.put_nowait(chunk)
+                except queue.Full:
+                    try:
+                        self._q.get_nowait()
+                    except queue.Empty:
+                        pass
+                    self._q.put_nowait(chunk)
+        
+        # Transcription runs off the audio callback thread
+        self._q = queue.Queue(maxsize=4)
+        
+        def transcribe_worker():
+            while not stop_event.is_set():
+                try:
+                    chunk = self._q.get(timeout=0.1)
+                except queue.Empty:
+                    continue
                 
                 # Transcribe chunk
                 text = self.transcribe_audio(chunk)
                 if text:
                     callback(text)
         
+        worker = threading.Thread(target=transcribe_worker, daemon=True)
+        worker.start()
+        
         try:
             # Start stream
             with sd.InputStream(
@@ -178,6 +268,9 @@ class TamilSTTEngine:
                     
         except Exception as e:
             print(f"❌ உணர்திறன் கேட்டல் பிழை: {e}")
+        finally:
+            stop_event.set()
+            worker.join()
     
     def save_audio(self, audio_data: np.ndarray, filename: Optional[str] = None):
         """
@@ -7,20 +7,33 @@
 import os
 import tempfile
 import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import Optional
+import numpy as np
+import sounddevice as sd
+import soundfile as sf
 from gtts import gTTS
-import playsound
 
 class TamilTTSEngine:
     """Tamil Text-to-Speech Engine using multiple backends"""
     
-    def __init__(self, cache_dir="./data/audio_cache", use_cache=True):
+    # Seconds to wait on the gTTS service before giving up
+    GTTS_TIMEOUT = 10
+    
+    def __init__(self, cache_dir="./data/audio_cache", use_cache=True, prewarm_phrases=None,
+                 piper_model: Optional[str] = None):
         """
         Initialize Tamil TTS Engine
         
         Args:
             cache_dir: Directory to cache audio files
             use_cache: Whether to use audio caching
+            prewarm_phrases: Phrases to cache in the background on first
+                run (None, the default, disables pre-warming)
+            piper_model: Path to a Piper voice (.onnx) for local synthesis;
+                gTTS is used when not given or unavailable
         """
         self.cache_dir = Path(cache_dir)
         self.use_cache = use_cache
@@ -30,6 +43,78 @@ class TamilTTSEngine:
         self.language = "ta"
         self.tld = "co.in"  # Indian domain for better Tamil pronunciation
         
+        # Local Piper voice, loaded once
+        self.piper = None
+        if piper_model:
+            self._load_piper(piper_model)
+        
+        # Pre-warm the cache once so common phrases never hit the network.
+        # Runs in the background: gTTS round trips must not delay startup
+        if (self.piper is None and self.use_cache and prewarm_phrases
+                and not self._is_prewarmed(prewarm_phrases)):
+            threading.Thread(
+                target=self.prewarm_cache, args=(list(prewarm_phrases),), daemon=True
+            ).start()
+        
+    def _load_piper(self, model_path: str):
+        """
+        Load a Piper voice for offline synthesis
+        
+        Args:
+            model_path: Path to the Piper .onnx voice model
+        """
+        try:
+            from piper import PiperVoice
+            self.piper = PiperVoice.load(model_path)
+            print(f"✅ Piper குரல் ஏற்றப்பட்டது: {model_path}")
+        except ImportError:
+            print("⚠️ piper-tts நிறுவப்படவில்லை, gTTS பயன்படுத்தப்படுகிறது")
+        except Exception as e:
+            print(f"⚠️ Piper குரல் ஏற்ற முடியவில்லை, gTTS பயன்படுத்தப்படுகிறது: {e}")
+    
+    def prewarm_cache(self, phrases: list) -> int:
+        """
+        Synthesize and cache phrases in parallel
+        
+        Args:
+            phrases: List of Tamil phrases to cache
+            
+        Returns:
+            Number of phrases successfully cached
+        """
+        def warm(text):
+            try:
+                return self.get_cached_audio(text) or self._synthesize_to_cache(text)
+            except Exception as e:
+                print(f"⚠️ முன்கூட்டிய கேச் தோல்வி: {e}")
+                return None
+        
+        print("🔥 பொதுவான சொற்றொடர்களை கேச் செய்கிறது...")
+        with ThreadPoolExecutor(8) as executor:
+            results = list(executor.map(warm, phrases))
+        
+        warmed = sum(1 for result in results if result)
+        
+        # Only mark as done once every phrase made it into the cache
+        if warmed == len(results):
+            try:
+                (self.cache_dir / ".prewarmed").write_text(self._phrases_digest(phrases))
+            except OSError:
+                pass
+        
+        return warmed
+    
+    def _phrases_digest(self, phrases: list) -> str:
+        """Digest of a phrase list, so a changed list is warmed again"""
+        return self.text_to_hash("\n".join(phrases))
+    
+    def _is_prewarmed(self, phrases: list) -> bool:
+        """Whether this exact phrase list has already been cached"""
+        try:
+            return (self.cache_dir / ".prewarmed").read_text() == self._phrases_digest(phrases)
+        except OSError:
+            return False
+    
     def text_to_hash(self, text: str) -> str:
         """
         Generate hash for Tamil text
@@ -38,9 +123,9 @@ class TamilTTSEngine:
             text: Tamil text
             
         Returns:
-            MD5 hash of text
+            128-bit BLAKE2b hash of text (32 hex chars)
         """
-        return hashlib.md5(text.encode('utf-8')).hexdigest()
+        return hashlib.blake2b(text.encode('utf-8'), digest_size=16).hexdigest()
     
     def get_cached_audio(self, text: str) -> Optional[str]:
         """
@@ -56,10 +141,12 @@ class TamilTTSEngine:
             return None
             
         text_hash = self.text_to_hash(text)
-        audio_file = self.cache_dir / f"{text_hash}.mp3"
         
-        if audio_file.exists():
-            return str(audio_file)
+        # Piper writes WAV, gTTS writes MP3
+        for suffix in (".wav", ".mp3"):
+            audio_file = self.cache_dir / f"{text_hash}{suffix}"
+            if audio_file.exists():
+                return str(audio_file)
         
         return None
     
@@ -67,6 +154,9 @@ class TamilTTSEngine:
         """
         Cache audio file for text
         
+        The file is moved into the cache, so audio_file no longer exists
+        afterwards on success.
+        
         Args:
             text: Tamil text
             audio_file: Path to audio file
@@ -78,11 +168,87 @@ class TamilTTSEngine:
         dest_file = self.cache_dir / f"{text_hash}.mp3"
         
         try:
-            import shutil
-            shutil.copy2(audio_file, dest_file)
+            os.replace(audio_file, dest_file)
         except Exception as e:
             print(f"⚠️ கேச் செய்ய முடியவில்லை: {e}")
     
+    def play_cached(self, path: str, wait: bool = True):
+        """
+        Play a previously cached audio file
+        
+        Args:
+            path: Path returned by get_cached_audio
+            wait: Whether to block until playback finishes
+        """
+        print("💾 கேச் செய்யப்பட்ட குரு பயன்படுத்தப்படுகிறது")
+        self._play(path, wait=wait)
+    
+    def _play(self, path: str, wait: bool = True):
+        """
+        Decode an audio file and play it in-process via sounddevice
+        
+        Args:
+            path: Path to audio file (MP3 or WAV)
+            wait: Whether to block until playback finishes
+        """
+        try:
+            data, sample_rate = sf.read(path, dtype='float32')
+        except Exception:
+            # Older libsndfile builds can't decode MP3
+            import audioread
+            with audioread.audio_open(path) as f:
+                sample_rate, channels = f.samplerate, f.channels
+                pcm = np.frombuffer(b"".join(f), dtype=np.int16)
+            data = (pcm.astype(np.float32) / 32768.0).reshape(-1, channels)
+        
+        sd.play(data, sample_rate)
+        if wait:
+            sd.wait()
+    
+    def _synthesize_to_cache(self, text: str, slow: bool = False) -> str:
+        """
+        Synthesize Tamil text with gTTS without playing it
+        
+        Args:
+            text: Tamil text to synthesize
+            slow: Whether to speak slowly
+            
+        Returns:
+            Path to cached audio file (temporary file if caching is disabled)
+        """
+        cached_file = self.get_cached_audio(text)
+        if cached_file:
+            return cached_file
+        
+        # Create temporary file next to the cache so caching is a rename
+        temp_dir = self.cache_dir if self.use_cache else None
+        with tempfile.NamedTemporaryFile(suffix=".mp3", dir=temp_dir, delete=False) as tmp:
+            temp_audio = tmp.name
+        
+        # Generate Tamil speech with Indian domain
+        tts = gTTS(
+            text=text,
+            lang=self.language,
+            tld=self.tld,
+            slow=slow,
+            timeout=self.GTTS_TIMEOUT
+        )
+        
+        # Save to file
+        try:
+            tts.save(temp_audio)
+        except Exception:
+            os.unlink(temp_audio)
+            raise
+        
+        # Cache the audio
+        self.cache_audio(text, temp_audio)
+        return self.get_cached_audio(text) or temp_audio
+    
+    def _is_cached_path(self, audio_file: str) -> bool:
+        """Check whether an audio path lives in the cache directory"""
+        return Path(audio_file).parent == self.cache_dir
+    
     def speak_gtts(self, text: str, slow: bool = False, wait: bool = True) -> str:
         """
         Convert Tamil text to speech using gTTS (Google)
@@ -98,42 +264,21 @@ class TamilTTSEngine:
         print(f"🔊 பேசுகிறது: {text[:50]}..." if len(text) > 50 else f"🔊 பேசுகிறது: {text}")
         
         # Check cache first
-        cached_file = self.get_cached_audio(text)
-        if cached_file:
+        if self.get_cached_audio(text):
             print("💾 கேச் செய்யப்பட்ட குரு பயன்படுத்தப்படுகிறது")
-            if wait:
-                playsound.playsound(cached_file)
-            return cached_file
         
         try:
-            # Create temporary file
-            with tempfile.NamedTemporaryFile(suffix=".mp3", delete=False) as tmp:
-                temp_audio = tmp.name
-            
-            # Generate Tamil speech with Indian domain
-            tts = gTTS(
-                text=text,
-                lang=self.language,
-                tld=self.tld,
-                slow=slow
-            )
-            
-            # Save to file
-            tts.save(temp_audio)
-            
-            # Cache the audio
-            self.cache_audio(text, temp_audio)
+            audio_file = self._synthesize_to_cache(text, slow=slow)
             
             # Play the audio
             if wait:
-                playsound.playsound(temp_audio)
+                self._play(audio_file)
+                
+                # Clean up temp file after playing
+                if not self._is_cached_path(audio_file):
+                    os.unlink(audio_file)
             
-            # Clean up temp file after playing
-            if wait:
-                os.unlink(temp_audio)
-                return cached_file if cached_file else temp_audio
-            else:
-                return temp_audio
+            return audio_file
                 
         except Exception as e:
             print(f"❌ TTS பிழை: {e}")
@@ -143,28 +288,119 @@ class TamilTTSEngine:
                 with tempfile.NamedTemporaryFile(suffix=".mp3", delete=False) as tmp:
                     temp_audio = tmp.name
                 tts.save(temp_audio)
-                playsound.playsound(temp_audio)
+                self._play(temp_audio)
                 os.unlink(temp_audio)
             except:
                 print("❌ விபத்து தவிர்ப்பு TTS தோல்வி")
             
             return ""
     
+    def speak_piper(self, text: str, wait: bool = True) -> str:
+        """
+        Convert Tamil text to speech locally using Piper
+        
+        Args:
+            text: Tamil text to speak
+            wait: Whether to wait for playback to finish
+            
+        Returns:
+            Path to cached WAV file, or empty string if caching is disabled
+        """
+        print(f"🔊 பேசுகிறது: {text[:50]}..." if len(text) > 50 else f"🔊 பேசுகிறது: {text}")
+        
+        audio_file = self.cache_dir / f"{self.text_to_hash(text)}.wav"
+        
+        if self.use_cache and audio_file.exists():
+            print("💾 கேச் செய்யப்பட்ட குரு பயன்படுத்தப்படுகிறது")
+            audio, sample_rate = sf.read(audio_file, dtype='int16')
+        else:
+            raw = b"".join(self.piper.synthesize_stream_raw(text))
+            audio = np.frombuffer(raw, dtype=np.int16)
+            sample_rate = self.piper.config.sample_rate
+            
+            # Cache the audio (write then rename so readers never see partial files)
+            if self.use_cache:
+                temp_file = audio_file.with_suffix(".part.wav")
+                sf.write(temp_file, audio, sample_rate)
+                os.replace(temp_file, audio_file)
+        
+        sd.play(audio, sample_rate)
+        if wait:
+            sd.wait()
+        
+        return str(audio_file) if self.use_cache else ""
+    
+    def speak(self, text: str, wait: bool = True) -> str:
+        """
+        Speak Tamil text with the best available backend
+        
+        Uses local Piper synthesis when a voice is loaded, otherwise gTTS.
+        
+        Args:
+            text: Tamil text to speak
+            wait: Whether to wait for playback to finish
+            
+        Returns:
+            Path to audio file
+        """
+        if self.piper is not None:
+            try:
+                return self.speak_piper(text, wait=wait)
+            except Exception as e:
+                print(f"⚠️ Piper பிழை, gTTS பயன்படுத்தப்படுகிறது: {e}")
+        
+        return self.speak_gtts(text, wait=wait)
+    
     def speak_multiple(self, texts: list, pause_duration: float = 0.5):
         """
         Speak multiple texts with pauses
         
+        Synthesis runs ahead in a thread pool so later phrases are fetched
+        while earlier ones play; repeated phrases are fetched once.
+        
         Args:
             texts: List of Tamil texts to speak
             pause_duration: Pause between texts in seconds
         """
         import time
         
-        for i, text in enumerate(texts):
-            if text.strip():  # Skip empty texts
-                self.speak_gtts(text, wait=True)
+        texts = [text for text in texts if text.strip()]  # Skip empty texts
+        
+        # Local synthesis is faster than realtime, no prefetch needed
+        if self.piper is not None:
+            for i, text in enumerate(texts):
+                self.speak(text, wait=True)
                 if i < len(texts) - 1:  # Pause except after last text
                     time.sleep(pause_duration)
+            return
+        
+        keys = [self.text_to_hash(text) for text in texts]
+        
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            futures = {}
+            for key, text in zip(keys, texts):
+                if key not in futures:
+                    futures[key] = executor.submit(self._synthesize_to_cache, text)
+            
+            for i, (key, text) in enumerate(zip(keys, texts)):
+                print(f"🔊 பேசுகிறது: {text[:50]}..." if len(text) > 50 else f"🔊 பேசுகிறது: {text}")
+                try:
+                    audio_file = futures[key].result()
+                    self._play(audio_file)
+                except Exception as e:
+                    print(f"❌ TTS பிழை: {e}")
+                    continue
+                
+                if i < len(texts) - 1:  # Pause except after last text
+                    time.sleep(pause_duration)
+        
+        # Clean up temp files when caching is disabled
+        for future in futures.values():
+            if future.exception() is None and not self._is_cached_path(future.result()):
+                try:
+                    os.unlink(future.result())
+                except OSError:
+                    pass
     
     def get_available_voices(self):
         """
@@ -172,6 +408,7 @@ class TamilTTSEngine:
         """
         voices = {
             "gtts": "Google Text-to-Speech (இணையம் தேவை)",
+            "piper": "Piper TTS (உள்ளூர், இணையம் தேவையில்லை)",
             "pyttsx3": "System TTS (வரையறுக்கப்பட்ட தமிழ் ஆதரவு)",
             "coqui": "Coqui TTS (அதிநவீன, ஆனால் நிறுவுதல் தேவை)"
         }
@@ -200,5 +437,5 @@ class TamilTTSEngine:
         print("🎵 தமிழ் உச்சரிப்பு சோதனை...")
         for phrase in test_phrases:
             print(f"  பேசும்: {phrase}")
-            self.speak_gtts(phrase, wait=True)
+            self.speak(phrase, wait=True)
             input("  அடுத்ததற்கு Enter அழுத்தவும்...")
\ No newline at end of file
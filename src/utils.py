@@ -6,20 +6,65 @@
 
 import os
 import sys
+import atexit
 import logging
+import queue
 import json
+import importlib.util
 from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener
 from typing import Any, Dict
 
+import numpy as np
+
+# orjson writes UTF-8 directly and is several times faster than stdlib json
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Tamil Unicode range: U+0B80 to U+0BFF
+TAMIL_START, TAMIL_END = 0x0B80, 0x0BFF
+
+# Per-codepoint lookup table for the BMP; cheaper than NumPy on short strings
+_TAMIL_LUT = bytearray(0x10000)
+_TAMIL_LUT[TAMIL_START:TAMIL_END + 1] = b"\x01" * (TAMIL_END + 1 - TAMIL_START)
+
+# Below this length the LUT loop beats NumPy's fixed call overhead
+_NUMPY_MIN_LEN = 64
+
+# Listener started by setup_logging; later calls reuse it
+_log_listener = None
+
 def setup_logging(log_file="tamil_assistant.log"):
-    """Setup logging configuration"""
+    """
+    Setup logging configuration
+    
+    Callers only enqueue records; a background listener thread does the
+    formatting and the file/console writes. Safe to call more than once.
+    """
+    global _log_listener
+    if _log_listener is not None:
+        return logging.getLogger(__name__)
+    
+    formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    handlers = [
+        logging.FileHandler(log_file, encoding='utf-8'),
+        logging.StreamHandler()
+    ]
+    for handler in handlers:
+        handler.setFormatter(formatter)
+    
+    log_queue = queue.SimpleQueue()
+    listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)
+    _log_listener = listener
+    
     logging.basicConfig(
         level=logging.INFO,
-        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        handlers=[
-            logging.FileHandler(log_file, encoding='utf-8'),
-            logging.StreamHandler()
-        ]
+        format='%(message)s',
+        handlers=[QueueHandler(log_queue)]
     )
     return logging.getLogger(__name__)
 
@@ -31,11 +76,23 @@ def print_tamil(text: str):
         # Fallback for systems without proper Tamil support
         print(text.encode('utf-8').decode('utf-8', 'ignore'))
 
+def json_dumps(data: Any) -> bytes:
+    """Serialize data to indented UTF-8 JSON bytes"""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(data, ensure_ascii=False, indent=2).encode('utf-8')
+
+def json_loads(data: bytes) -> Any:
+    """Parse JSON from UTF-8 bytes"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
 def save_to_json(data: Dict[str, Any], filename: str):
     """Save data to JSON file with Tamil support"""
     try:
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+        with open(filename, 'wb') as f:
+            f.write(json_dumps(data))
         return True
     except Exception as e:
         print_tamil(f"❌ JSON சேமிப்பு பிழை: {e}")
@@ -44,8 +101,8 @@ def save_to_json(data: Dict[str, Any], filename: str):
 def load_from_json(filename: str) -> Dict[str, Any]:
     """Load data from JSON file"""
     try:
-        with open(filename, 'r', encoding='utf-8') as f:
-            return json.load(f)
+        with open(filename, 'rb') as f:
+            return json_loads(f.read())
     except FileNotFoundError:
         return {}
     except Exception as e:
@@ -76,24 +133,25 @@ def format_tamil_date() -> str:
 
 def check_dependencies():
     """Check for required dependencies"""
-    required_packages = [
-        'transformers',
-        'torch',
-        'langchain',
-        'chromadb',
-        'sentence-transformers',
-        'gtts',
-        'playsound',
-        'sounddevice',
-        'soundfile'
-    ]
+    # pip package name -> importable module names, any one of which will do
+    required_packages = {
+        'transformers': ('transformers',),
+        'torch': ('torch',),
+        'langchain': ('langchain',),
+        'chromadb': ('chromadb',),
+        'sentence-transformers': ('sentence_transformers',),
+        # STT uses faster-whisper, falling back to openai-whisper
+        'faster-whisper': ('faster_whisper', 'whisper'),
+        'gtts': ('gtts',),
+        'sounddevice': ('sounddevice',),
+        'soundfile': ('soundfile',)
+    }
     
-    missing = []
-    for package in required_packages:
-        try:
-            __import__(package.replace('-', '_'))
-        except ImportError:
-            missing.append(package)
+    # find_spec only locates the module, it doesn't execute the package
+    missing = [
+        package for package, modules in required_packages.items()
+        if all(importlib.util.find_spec(module) is None for module in modules)
+    ]
     
     if missing:
         print_tamil(f"⚠️ காணாமல் போன சார்புகள்: {', '.join(missing)}")
@@ -128,24 +186,19 @@ def get_system_info() -> Dict[str, str]:
         'encoding': sys.getdefaultencoding()
     }
 
+def _tamil_mask(text: str) -> np.ndarray:
+    """Boolean mask of Tamil code points in text"""
+    codepoints = np.frombuffer(text.encode('utf-32-le'), dtype=np.uint32)
+    return (codepoints >= TAMIL_START) & (codepoints <= TAMIL_END)
+
 def validate_tamil_text(text: str) -> bool:
     """Check if text contains Tamil characters"""
-    # Tamil Unicode range: U+0B80 to U+0BFF
-    tamil_range = range(0x0B80, 0x0BFF + 1)
-    
-    for char in text:
-        if ord(char) in tamil_range:
-            return True
-    
-    return False
+    if len(text) < _NUMPY_MIN_LEN:
+        return any(_TAMIL_LUT[o] for c in text if (o := ord(c)) < 0x10000)
+    return bool(_tamil_mask(text).any())
 
 def get_tamil_char_count(text: str) -> int:
     """Count Tamil characters in text"""
-    tamil_range = range(0x0B80, 0x0BFF + 1)
-    count = 0
-    
-    for char in text:
-        if ord(char) in tamil_range:
-            count += 1
-    
-    return count
\ No newline at end of file
+    if len(text) < _NUMPY_MIN_LEN:
+        return sum(_TAMIL_LUT[o] for c in text if (o := ord(c)) < 0x10000)
+    return int(_tamil_mask(text).sum())
@@ -6,21 +6,81 @@ Main Tamil Voice Assistant Class
 """
 
 import os
+import re
+import sys
+import logging
 import time
+import random
 import threading
 import queue
-from typing import Optional, Dict, Any
+import zipfile
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Optional, Dict, Any, List
 from datetime import datetime
+import numpy as np
 
 # Import local modules
 from .stt_engine import TamilSTTEngine
 from .tts_engine import TamilTTSEngine
 from .knowledge_base import TamilKnowledgeBase
 from .document_processor import TamilDocumentProcessor
+from ._fast import topk_cosine, warmup as warmup_kernels
+
+# Diagnostics go through logging (queued when set up via utils.setup_logging);
+# prompts and status meant for the user stay as console output
+logger = logging.getLogger(__name__)
+
+# Special command triggers (interned so matches compare by identity first).
+# Tamil has no case; the ASCII ones are matched against the lowercased query
+_GREET_TRIGGERS = tuple(map(sys.intern, ('வணக்கம்', 'ஹலோ', 'hello', 'hi', 'ஹாய்')))
+_HELP_TRIGGERS = tuple(map(sys.intern, ('உதவி', 'help')))
+_ABOUT_TRIGGERS = tuple(map(sys.intern, ('உனக்கு பற்றி', 'about')))
+_STATS_TRIGGERS = tuple(map(sys.intern, ('புள்ளிவிவரம்', 'stats')))
+_EXIT_TRIGGERS = tuple(map(sys.intern, ('exit', 'stop')))
+
+@dataclass(frozen=True)
+class Turn:
+    """One conversation history entry"""
+    __slots__ = ('role', 'content', 'ts_ns')
+    
+    role: str
+    content: str
+    ts_ns: int  # time.time_ns()
 
 class TamilVoiceAssistant:
     """Main Tamil Voice Assistant class"""
     
+    # Rule-based answer templates, as (context, query) -> str thunks
+    RESPONSE_TEMPLATES = (
+        lambda context, query: f"எனது குறிப்புகளின்படி: {context}\n\nஇது உங்கள் கேள்விக்கான பதில்: இதில் இருந்து, {query} பற்றி மேலே கொடுக்கப்பட்ட தகவல்கள் உள்ளன.",
+        lambda context, query: f"ஆவணங்களிலிருந்து கிடைத்த தகவல்:\n{context}\n\n{query} - இது பற்றி மேலே உள்ள தகவல்களைப் பார்க்கவும்.",
+        lambda context, query: f"எனது தரவுகளின்படி:\n{context}\n\nஇந்தத் தகவல்களின் அடிப்படையில், உங்கள் கேள்விக்கான பதில் காணப்படுகிறது."
+    )
+    
+    # Sentence boundaries for streamed speech
+    _SENTENCE_SPLIT = re.compile(r'(?<=[.?!।])\s+|\n+')
+    
+    # Semantic query cache: ring of recent query embeddings and their contexts
+    QUERY_CACHE_SIZE = 256
+    QUERY_CACHE_THRESHOLD = 0.92
+    QUERY_CACHE_SAVE_DELAY = 30.0  # Seconds; inserts within the window share one save
+    QUERY_CACHE_FORMAT = 2  # Bumped when the stored vectors change meaning
+    
+    # Fixed spoken phrases (pre-synthesized by the TTS engine on first run)
+    GREETINGS = (
+        "வணக்கம்! நான் உங்கள் தமிழ் திட்ட உதவியாளர்.",
+        "உங்கள் திட்டங்களைப் பற்றி கேளுங்கள்.",
+        "நான் உங்கள் குறிப்புகளிலிருந்து பதிலளிப்பேன்."
+    )
+    WELCOME_MESSAGE = "தமிழ் குரு உதவியாளர் தயார். உதவி என்று சொல்லுங்கள்."
+    GOODBYE_MESSAGE = "நன்றி, பயன்பாட்டை மூடுகிறது."
+    NO_ANSWER_MESSAGE = "மன்னிக்கவும், உங்கள் கேள்விக்கான தகவல் எனது ஆவணங்களில் கிடைக்கவில்லை."
+    SEARCH_ERROR_MESSAGE = "மன்னிக்கவும், தேடலில் பிழை ஏற்பட்டுள்ளது."
+    KB_NOT_READY_MESSAGE = "அறிவுத் தளம் தயார் நிலையில் இல்லை."
+    
     def __init__(self, config: Optional[Dict[str, Any]] = None):
         """
         Initialize Tamil Voice Assistant
@@ -40,27 +100,79 @@ class TamilVoiceAssistant:
         self.knowledge_base = None
         self.document_processor = None
         
-        # Conversation state
-        self.conversation_history = []
+        # Per-instance RNG for picking greetings and templates
+        self._rng = random.Random()
+        
+        # Conversation state (bounded; oldest messages drop off automatically)
+        self.conversation_history = deque(
+            maxlen=self.config.get('assistant', {}).get('max_history', 10)
+        )
+        self._history_view = None  # Snapshot served by get_conversation_history
         self.is_listening = False
         self.stop_event = threading.Event()
         self.command_queue = queue.Queue()
+        self._capture_stop_event = threading.Event()
+        
+        # Capture pauses while the assistant answers: sounddevice shares one
+        # global stream, and the mic must not record the assistant's own voice
+        self._speaking = threading.Event()
+        self._audio_lock = threading.Lock()  # Held while recording or playing
+        
+        # Bumped whenever indexed documents change; keys the about/stats text
+        self._kb_version = 0
+        self._about_cache = None
+        self._stats_cache = None
+        
+        # Response text -> cached audio path, skips the stat on hot phrases
+        self._cached_audio_path = lru_cache(maxsize=128)(self._lookup_cached_audio)
         
         # Wake word detection
         self.wake_word = self.config.get('assistant', {}).get('wake_word', 'உதவி')
         self.exit_word = self.config.get('assistant', {}).get('exit_word', 'நிறுத்து')
         
+        # Wake/exit word scan over transcripts, compiled once
+        self._wake_exit_re = re.compile(
+            f"(?P<wake>{re.escape(self.wake_word)})|(?P<exit>{re.escape(self.exit_word)})"
+        )
+        
+        # Special command triggers, compiled once
+        self._build_command_matcher()
+        
         # Initialize engines
         self._initialize_engines()
         
+        # Semantic query cache (filled lazily, persisted next to the audio cache)
+        self._qcache_path = os.path.join(self.cache_dir, "query_cache.npz")
+        self._qcache_vecs = np.zeros((0, 0), dtype=np.float32)
+        self._qcache_ctx = []
+        self._qcache_next = 0
+        self._qcache_lock = threading.RLock()  # Background indexing clears it
+        self._qcache_dirty = False
+        self._qcache_timer = None
+        self._load_query_cache()
+        
         # Greeting messages
-        self.greetings = [
-            "வணக்கம்! நான் உங்கள் தமிழ் திட்ட உதவியாளர்.",
-            "உங்கள் திட்டங்களைப் பற்றி கேளுங்கள்.",
-            "நான் உங்கள் குறிப்புகளிலிருந்து பதிலளிப்பேன்."
-        ]
+        self.greetings = list(self.GREETINGS)
         
         print("🤖 தமிழ் குரு உதவியாளர் துவக்கப்பட்டது")
+        
+        # Pay first-use costs now instead of on the first query. Not joined:
+        # a query in the first moments after startup may still pay them
+        threading.Thread(target=self._warmup, daemon=True).start()
+    
+    def _warmup(self):
+        """Touch every lazily initialized path of the query pipeline once"""
+        try:
+            self._match_commands("warmup")
+            self._generate_response("warmup", "warmup")
+            
+            if self.knowledge_base and self.knowledge_base.vectorstore is not None:
+                # Loads the HNSW index and runs the embedding model once
+                self.knowledge_base.search("warmup", k=1)
+            
+            # TTS needs nothing here: the engine pre-warms its cache in the background
+        except Exception as e:
+            logger.warning(f"⚠️ முன்சூடாக்கல் பிழை: {e}")
     
     def _load_default_config(self) -> Dict[str, Any]:
         """Load default configuration"""
@@ -80,7 +192,9 @@ class TamilVoiceAssistant:
                 "exit_word": "நிறுத்து",
                 "enable_voice": True,
                 "enable_history": True,
-                "max_history": 10
+                "max_history": 10,
+                "always_transcribe": False,
+                "prewarm_tts": True
             }
         }
     
@@ -88,57 +202,143 @@ class TamilVoiceAssistant:
         """Create necessary directories"""
         paths = self.config['paths']
         
+        # One stat per directory on warm starts; mkdir only what is missing
         for path_key in ['documents', 'audio_cache', 'chroma_db']:
             path = paths.get(path_key)
-            if path:
+            if path and not os.path.isdir(path):
                 os.makedirs(path, exist_ok=True)
+        
+        self.docs_dir = paths.get('documents', './data/documents')
+        self.cache_dir = paths.get('audio_cache', './data/audio_cache')
+        self.chroma_dir = paths.get('chroma_db', './data/chroma_db')
     
     def _initialize_engines(self):
-        """Initialize all AI engines"""
+        """Initialize all AI engines concurrently"""
         print("🔧 உதவியாளர் பொறிகளை துவக்குகிறது...")
         
-        # Initialize STT
+        # Compile the similarity kernel while the models load
+        threading.Thread(target=warmup_kernels, daemon=True).start()
+        
+        # Engines are independent and mostly model-load/IO bound, so
+        # startup takes roughly as long as the slowest one
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            futures = {
+                executor.submit(self._init_stt): 'STT',
+                executor.submit(self._init_tts): 'TTS',
+                executor.submit(self._init_document_processor): 'documents',
+                executor.submit(self._init_knowledge_base): 'knowledge base'
+            }
+            for future in as_completed(futures):
+                if future.exception():
+                    logger.error(f"❌ {futures[future]} துவக்கப் பிழை: {future.exception()}")
+    
+    def _init_stt(self):
+        """Initialize STT engine"""
         try:
             self.stt_engine = TamilSTTEngine(
                 model_name=self.config['models'].get('stt_model', 'base')
             )
             print("✅ STT பொறி தயார்")
         except Exception as e:
-            print(f"❌ STT பொறி பிழை: {e}")
-        
-        # Initialize TTS
+            logger.error(f"❌ STT பொறி பிழை: {e}")
+    
+    def _init_tts(self):
+        """Initialize TTS engine"""
         try:
-            cache_dir = self.config['paths'].get('audio_cache', './data/audio_cache')
-            self.tts_engine = TamilTTSEngine(cache_dir=cache_dir)
+            self.tts_engine = TamilTTSEngine(
+                cache_dir=self.cache_dir,
+                prewarm_phrases=(
+                    self._prewarm_phrases()
+                    if self.config.get('assistant', {}).get('prewarm_tts', True) else None
+                ),
+                piper_model=self.config['models'].get('tts_model')
+            )
             print("✅ TTS பொறி தயார்")
         except Exception as e:
-            print(f"❌ TTS பொறி பிழை: {e}")
-        
-        # Initialize Document Processor
+            logger.error(f"❌ TTS பொறி பிழை: {e}")
+    
+    def _prewarm_phrases(self) -> List[str]:
+        """Fixed phrases to pre-cache, whole and as the sentences streamed speech plays"""
+        phrases = [
+            *self.GREETINGS,
+            self.WELCOME_MESSAGE,
+            self.GOODBYE_MESSAGE,
+            self.NO_ANSWER_MESSAGE,
+            self.SEARCH_ERROR_MESSAGE,
+            self.KB_NOT_READY_MESSAGE,
+        ]
+        for phrase in list(phrases):
+            phrases.extend(part for part in self._SENTENCE_SPLIT.split(phrase) if part.strip())
+        return list(dict.fromkeys(phrases))
+    
+    def _init_document_processor(self):
+        """Initialize document processor"""
         try:
-            docs_dir = self.config['paths'].get('documents', './data/documents')
-            self.document_processor = TamilDocumentProcessor(docs_dir)
+            self.document_processor = TamilDocumentProcessor(self.docs_dir)
             print("✅ ஆவண செயலாக்கி தயார்")
         except Exception as e:
-            print(f"❌ ஆவண செயலாக்கி பிழை: {e}")
-        
-        # Initialize Knowledge Base
+            logger.error(f"❌ ஆவண செயலாக்கி பிழை: {e}")
+    
+    def _init_knowledge_base(self):
+        """Initialize the knowledge base and build it if needed"""
         try:
-            docs_dir = self.config['paths'].get('documents', './data/documents')
-            chroma_dir = self.config['paths'].get('chroma_db', './data/chroma_db')
-            self.knowledge_base = TamilKnowledgeBase(docs_dir, chroma_dir)
+            self.knowledge_base = TamilKnowledgeBase(self.docs_dir, self.chroma_dir)
             print("✅ அறிவுத் தளம் தயார்")
         except Exception as e:
-            print(f"❌ அறிவுத் தளம் பிழை: {e}")
+            logger.error(f"❌ அறிவுத் தளம் பிழை: {e}")
         
-        # Build knowledge base if needed
+        # Build knowledge base if needed; warm starts only re-index changed files
         if self.knowledge_base:
-            self.knowledge_base.build_knowledge_base()
+            self.knowledge_base.build_knowledge_base(
+                paths=self.knowledge_base.changed_documents()
+            )
+            self._kb_version += 1
     
     def speak_response(self, text: str):
-        """Speak response using TTS"""
-        if self.tts_engine and text.strip():
-            self.tts_engine.speak_gtts(text)
+        """Speak response using TTS, replaying cached audio when available"""
+        if not (self.tts_engine and text.strip()):
+            return
+        
+        try:
+            self.tts_engine.play_cached(self._cached_audio_path(text))
+            return
+        except KeyError:
+            pass  # Not cached yet
+        except Exception:
+            # Cached file went away; forget the stale path
+            self._cached_audio_path.cache_clear()
+        
+        # Synthesize once; the engine writes the audio into the cache
+        self.tts_engine.speak(text)
+    
+    def speak_response_streaming(self, text: str):
+        """
+        Speak a long response sentence by sentence
+        
+        Later sentences are synthesized while earlier ones play, so the
+        first audio starts after one sentence instead of the whole text.
+        Each sentence is cached independently.
+        """
+        if not (self.tts_engine and text.strip()):
+            return
+        
+        sentences = [part for part in self._SENTENCE_SPLIT.split(text.strip()) if part.strip()]
+        if len(sentences) <= 1:
+            self.speak_response(text)
+            return
+        
+        self.tts_engine.speak_multiple(sentences, pause_duration=0)
+    
+    def _lookup_cached_audio(self, text: str) -> str:
+        """
+        Find cached audio for a response
+        
+        Raises KeyError on a miss so lru_cache only remembers hits.
+        """
+        path = self.tts_engine.get_cached_audio(text)
+        if path is None:
+            raise KeyError(text)
+        return path
     
     def process_text_query(self, query: str) -> str:
         """
@@ -150,7 +350,7 @@ class TamilVoiceAssistant:
         Returns:
             Response in Tamil
         """
-        print(f"🧠 கேள்வி செயலாக்கம்: {query}")
+        logger.info(f"🧠 கேள்வி செயலாக்கம்: {query}")
         
         # Add to conversation history
         self._add_to_history("user", query)
@@ -164,29 +364,161 @@ class TamilVoiceAssistant:
         # Search knowledge base
         if self.knowledge_base:
             try:
-                # Search for relevant information
-                search_results = self.knowledge_base.search(query, k=3)
+                # Reuse the context of a semantically similar earlier query.
+                # The embedding is memoized, so search() below reuses it
+                query_vec = self.knowledge_base.embed_query(query)
+                context = self._query_cache_lookup(query_vec)
                 
-                if search_results:
-                    # Extract relevant context
-                    context = "\n\n".join([r['content'] for r in search_results[:2]])
+                if context is None:
+                    # Indexing may finish mid-search; such results aren't cached
+                    kb_version = self._kb_version
                     
+                    # Search for relevant information
+                    search_results = self.knowledge_base.search(query, k=3)
+                    if search_results:
+                        # Extract relevant context
+                        context = self._build_context(search_results[:2])
+                        self._query_cache_insert(query_vec, context, kb_version)
+                
+                if context:
                     # Generate response based on context
                     response = self._generate_response(query, context)
                 else:
-                    response = "மன்னிக்கவும், உங்கள் கேள்விக்கான தகவல் எனது ஆவணங்களில் கிடைக்கவில்லை."
+                    response = self.NO_ANSWER_MESSAGE
                     
             except Exception as e:
-                print(f"❌ அறிவுத் தள தேடல் பிழை: {e}")
-                response = "மன்னிக்கவும், தேடலில் பிழை ஏற்பட்டுள்ளது."
+                logger.error(f"❌ அறிவுத் தள தேடல் பிழை: {e}")
+                response = self.SEARCH_ERROR_MESSAGE
         else:
-            response = "அறிவுத் தளம் தயார் நிலையில் இல்லை."
+            response = self.KB_NOT_READY_MESSAGE
         
         # Add to conversation history
         self._add_to_history("assistant", response)
         
         return response
     
+    def _query_cache_lookup(self, query_vec: np.ndarray) -> Optional[str]:
+        """
+        Find the context of a cached query with cosine similarity above threshold
+        
+        Args:
+            query_vec: L2-normalized query embedding
+            
+        Returns:
+            Cached context or None on a miss
+        """
+        with self._qcache_lock:
+            if not self._qcache_ctx or self._qcache_vecs.shape[1] != query_vec.shape[0]:
+                return None
+            
+            idx, sims = topk_cosine(self._qcache_vecs[:len(self._qcache_ctx)], query_vec, 1)
+            if sims[0] >= self.QUERY_CACHE_THRESHOLD:
+                return self._qcache_ctx[int(idx[0])]
+        
+        return None
+    
+    def _query_cache_insert(self, query_vec: np.ndarray, context: str, kb_version: int):
+        """
+        Add a query embedding and its context, evicting the oldest when full
+        
+        Args:
+            query_vec: L2-normalized query embedding
+            context: Retrieved context for the query
+            kb_version: _kb_version the context was retrieved under
+        """
+        with self._qcache_lock:
+            if kb_version != self._kb_version:
+                return  # Built from the previous index
+            
+            if self._qcache_vecs.shape[1] != query_vec.shape[0]:
+                self._clear_query_cache(dim=query_vec.shape[0])
+            
+            slot = self._qcache_next
+            self._qcache_vecs[slot] = query_vec
+            if slot < len(self._qcache_ctx):
+                self._qcache_ctx[slot] = context
+            else:
+                self._qcache_ctx.append(context)
+            self._qcache_next = (slot + 1) % self.QUERY_CACHE_SIZE
+            
+            # Persist lazily: one write per burst of queries, not per query
+            self._qcache_dirty = True
+            if self._qcache_timer is None:
+                self._qcache_timer = threading.Timer(self.QUERY_CACHE_SAVE_DELAY, self.flush_query_cache)
+                self._qcache_timer.daemon = True
+                self._qcache_timer.start()
+    
+    def _clear_query_cache(self, dim: int = 0):
+        """Drop all cached queries (after the knowledge base changes)"""
+        with self._qcache_lock:
+            self._qcache_vecs = np.zeros((self.QUERY_CACHE_SIZE if dim else 0, dim), dtype=np.float32)
+            self._qcache_ctx = []
+            self._qcache_next = 0
+            self._qcache_dirty = False
+            if not dim and os.path.exists(self._qcache_path):
+                os.remove(self._qcache_path)
+    
+    def flush_query_cache(self):
+        """Write pending query cache changes to disk (call before exiting)"""
+        with self._qcache_lock:
+            if self._qcache_timer is not None:
+                self._qcache_timer.cancel()
+                self._qcache_timer = None
+            if self._qcache_dirty:
+                self._save_query_cache()
+                self._qcache_dirty = False
+    
+    def _kb_stamp(self) -> str:
+        """Identify the current knowledge base contents"""
+        if not self.knowledge_base:
+            return ""
+        return str(self.knowledge_base.metadata.get('last_updated'))
+    
+    def _load_query_cache(self):
+        """Load the persisted query cache if it matches the knowledge base"""
+        try:
+            with np.load(self._qcache_path) as data:
+                if (int(data['format']) != self.QUERY_CACHE_FORMAT
+                        or str(data['kb_stamp']) != self._kb_stamp()):
+                    return
+                vecs, contexts = data['vecs'], data['contexts'].tolist()
+                next_slot = int(data['next'])
+            if (vecs.ndim != 2 or len(vecs) != len(contexts)
+                    or len(vecs) > self.QUERY_CACHE_SIZE or not 0 <= next_slot < self.QUERY_CACHE_SIZE):
+                raise ValueError("inconsistent query cache")
+        except FileNotFoundError:
+            return
+        except (OSError, KeyError, ValueError, EOFError, zipfile.BadZipFile) as e:
+            # Truncated or corrupt file (e.g. killed mid-write): start empty
+            logger.warning(f"⚠️ கேள்வி கேச் படிக்க முடியவில்லை, நீக்கப்படுகிறது: {e}")
+            try:
+                os.remove(self._qcache_path)
+            except OSError:
+                pass
+            return
+        
+        with self._qcache_lock:
+            self._clear_query_cache(dim=vecs.shape[1])
+            self._qcache_vecs[:len(vecs)] = vecs
+            self._qcache_ctx = contexts
+            self._qcache_next = next_slot
+    
+    def _save_query_cache(self):
+        """Persist the query cache (write then rename)"""
+        tmp_path = self._qcache_path + ".tmp.npz"
+        try:
+            np.savez(
+                tmp_path,
+                vecs=self._qcache_vecs[:len(self._qcache_ctx)],
+                contexts=np.array(self._qcache_ctx),
+                next=self._qcache_next,
+                kb_stamp=self._kb_stamp(),
+                format=self.QUERY_CACHE_FORMAT
+            )
+            os.replace(tmp_path, self._qcache_path)
+        except OSError as e:
+            logger.warning(f"⚠️ கேள்வி கேச் சேமிக்க முடியவில்லை: {e}")
+    
     def _generate_response(self, query: str, context: str) -> str:
         """
         Generate response based on query and context
@@ -201,21 +533,72 @@ class TamilVoiceAssistant:
         # Simple rule-based response generation
         # In production, you would use an LLM here
         
-        response_templates = [
-            "எனது குறிப்புகளின்படி: {context}\n\nஇது உங்கள் கேள்விக்கான பதில்: இதில் இருந்து, {query} பற்றி மேலே கொடுக்கப்பட்ட தகவல்கள் உள்ளன.",
-            "ஆவணங்களிலிருந்து கிடைத்த தகவல்:\n{context}\n\n{query} - இது பற்றி மேலே உள்ள தகவல்களைப் பார்க்கவும்.",
-            "எனது தரவுகளின்படி:\n{context}\n\nஇந்தத் தகவல்களின் அடிப்படையில், உங்கள் கேள்விக்கான பதில் காணப்படுகிறது."
-        ]
+        templates = self.RESPONSE_TEMPLATES
+        template = templates[self._rng.randrange(len(templates))]
         
-        import random
-        template = random.choice(response_templates)
+        return template(context, query)
+    
+    @staticmethod
+    def _build_context(search_results, limit: int = 500) -> str:
+        """
+        Join result contents with blank lines, reading only up to limit chars
+        
+        Args:
+            search_results: Knowledge base search results
+            limit: Maximum context length; longer context ends with "..."
+            
+        Returns:
+            Bounded context string
+        """
+        parts = []
+        total = 0
+        for i, result in enumerate(search_results):
+            for piece in (("\n\n",) if i else ()) + (result['content'],):
+                # Read one char past the limit to know whether to truncate
+                parts.append(piece[:limit + 1 - total])
+                total += len(parts[-1])
+                if total > limit:
+                    return "".join(parts)[:limit - 3] + "..."
+        
+        return "".join(parts)
+    
+    def _build_command_matcher(self):
+        """Compile all special command triggers into a single-pass matcher"""
+        triggers = [
+            (keyword, tag)
+            for keywords, tag in (
+                (_GREET_TRIGGERS, 'greet'),
+                (_HELP_TRIGGERS, 'help'),
+                (_ABOUT_TRIGGERS, 'about'),
+                (_STATS_TRIGGERS, 'stats'),
+                ((sys.intern(self.exit_word.lower()),) + _EXIT_TRIGGERS, 'exit')
+            )
+            for keyword in keywords
+        ]
         
-        # Truncate context if too long
-        if len(context) > 500:
-            context = context[:497] + "..."
+        # When several commands match, the earlier one here wins
+        self._cmd_priority = {tag: i for i, tag in enumerate(['greet', 'help', 'about', 'stats', 'exit'])}
+        self._cmd_dispatch = {
+            'greet': lambda: self.greetings[self._rng.randrange(len(self.greetings))],
+            'help': self._get_help_response,
+            'about': self._get_about_response,
+            'stats': self._get_stats_response,
+            'exit': lambda: "நன்றி! பின்னர் சந்திப்போம். நிறுத்த கட்டளையை அனுப்பவும்."
+        }
         
-        response = template.format(context=context, query=query)
-        return response
+        try:
+            import ahocorasick
+            automaton = ahocorasick.Automaton()
+            for keyword, tag in triggers:
+                automaton.add_word(keyword, tag)
+            automaton.make_automaton()
+            self._match_commands = lambda text: {tag for _, tag in automaton.iter(text)}
+        except ImportError:
+            # Lookahead alternation reports overlapping matches too
+            tag_of = dict(triggers)
+            keywords = sorted(tag_of, key=len, reverse=True)
+            pattern = re.compile("(?=(" + "|".join(map(re.escape, keywords)) + "))")
+            self._match_commands = lambda text: {tag_of[m.group(1)] for m in pattern.finditer(text)}
     
     def _handle_special_commands(self, query: str) -> Optional[str]:
         """
@@ -227,31 +610,11 @@ class TamilVoiceAssistant:
         Returns:
             Response if it's a special command, None otherwise
         """
-        query_lower = query.lower()
-        
-        # Greetings
-        greetings = ['வணக்கம்', 'ஹலோ', 'hello', 'hi', 'ஹாய்']
-        if any(greet in query_lower for greet in greetings):
-            import random
-            return random.choice(self.greetings)
-        
-        # Help
-        if 'உதவி' in query or 'help' in query_lower:
-            return self._get_help_response()
-        
-        # About
-        if 'உனக்கு பற்றி' in query or 'about' in query_lower:
-            return self._get_about_response()
+        tags = self._match_commands(query.lower())
+        if not tags:
+            return None
         
-        # Stats
-        if 'புள்ளிவிவரம்' in query or 'stats' in query_lower:
-            return self._get_stats_response()
-        
-        # Exit/Stop
-        if self.exit_word in query or 'exit' in query_lower or 'stop' in query_lower:
-            return "நன்றி! பின்னர் சந்திப்போம். நிறுத்த கட்டளையை அனுப்பவும்."
-        
-        return None
+        return self._cmd_dispatch[min(tags, key=self._cmd_priority.get)]()
     
     def _get_help_response(self) -> str:
         """Get help response"""
@@ -272,9 +635,13 @@ class TamilVoiceAssistant:
 நான் உங்கள் தமிழ் ஆவணங்களிலிருந்து பதிலளிப்பேன்."""
     
     def _get_about_response(self) -> str:
-        """Get about response"""
+        """Get about response (rebuilt only after the documents change)"""
+        if self._about_cache and self._about_cache[0] == self._kb_version:
+            return self._about_cache[1]
+        
+        version = self._kb_version
         doc_count = len(self.document_processor.list_documents()) if self.document_processor else 0
-        return f"""நான் உங்கள் தமிழ் திட்ட உதவியாளர்.
+        text = f"""நான் உங்கள் தமிழ் திட்ட உதவியாளர்.
 
 • மொழி: தமிழ்
 • ஆவணங்கள்: {doc_count}
@@ -282,35 +649,33 @@ class TamilVoiceAssistant:
 • பதிப்பு: 1.0
 
 நீங்கள் சேமித்த திட்டங்கள் மற்றும் குறிப்புகளின் அடிப்படையில் நான் பதிலளிப்பேன்."""
+        
+        self._about_cache = (version, text)
+        return text
     
     def _get_stats_response(self) -> str:
-        """Get statistics response"""
+        """Get statistics response (knowledge base part cached per version)"""
         if not self.knowledge_base:
-            return "அறிவுத் தளம் தயார் நிலையில் இல்லை."
+            return self.KB_NOT_READY_MESSAGE
         
-        stats = self.knowledge_base.get_stats()
-        
-        return f"""அறிவுத் தள புள்ளிவிவரங்கள்:
+        if not (self._stats_cache and self._stats_cache[0] == self._kb_version):
+            version = self._kb_version
+            stats = self.knowledge_base.get_stats()
+            self._stats_cache = (version, f"""அறிவுத் தள புள்ளிவிவரங்கள்:
 
 • ஆவணங்கள்: {stats.get('document_count', 0)}
 • பகுதிகள்: {stats.get('chunk_count', 0)}
 • கடைசி புதுப்பிப்பு: {stats.get('last_updated', 'இல்லை')}
-• உரையாடல் வரலாறு: {len(self.conversation_history)}"""
+""")
+        
+        return f"{self._stats_cache[1]}• உரையாடல் வரலாறு: {len(self.conversation_history)}"
     
     def _add_to_history(self, role: str, content: str):
         """Add message to conversation history"""
         if self.config.get('assistant', {}).get('enable_history', True):
-            max_history = self.config.get('assistant', {}).get('max_history', 10)
-            
-            self.conversation_history.append({
-                'role': role,
-                'content': content,
-                'timestamp': datetime.now().isoformat()
-            })
-            
-            # Keep only last N messages
-            if len(self.conversation_history) > max_history:
-                self.conversation_history = self.conversation_history[-max_history:]
+            # Timestamp is formatted only on export
+            self.conversation_history.append(Turn(role, content, time.time_ns()))
+            self._history_view = None
     
     def start_continuous_listening(self):
         """Start continuous voice listening"""
@@ -327,52 +692,152 @@ class TamilVoiceAssistant:
         self.stop_event.clear()
         
         # Speak welcome message
-        self.speak_response("தமிழ் குரு உதவியாளர் தயார். உதவி என்று சொல்லுங்கள்.")
+        self.speak_response(self.WELCOME_MESSAGE)
+        
+        # Record and transcribe in the background while queries are answered
+        while not self.command_queue.empty():
+            self.command_queue.get_nowait()
+        self._capture_stop_event.clear()
+        self._speaking.clear()
+        capture_thread = threading.Thread(target=self._capture_loop, daemon=True)
+        capture_thread.start()
         
         try:
             while not self.stop_event.is_set():
-                # Listen for audio
-                print("\n🔴 கேட்கிறது... (பேசுங்கள்)")
-                transcribed_text, audio_data = self.stt_engine.listen_and_transcribe(duration=5)
+                try:
+                    transcribed_text = self.command_queue.get(timeout=0.1)
+                except queue.Empty:
+                    continue
                 
-                if transcribed_text:
+                # The producer paused capture before queueing this item;
+                # resume only once it has been fully handled
+                try:
+                    # Find wake and exit words in a single pass
+                    found = {m.lastgroup for m in self._wake_exit_re.finditer(transcribed_text)}
+                    
                     # Check for wake word
-                    if self.wake_word in transcribed_text or self.is_listening:
+                    if 'wake' in found or self.is_listening:
                         # Remove wake word from query
-                        query = transcribed_text.replace(self.wake_word, "").strip()
+                        query = transcribed_text
+                        if 'wake' in found:
+                            query = query.replace(self.wake_word, "")
+                        query = query.strip()
                         
                         if query:
                             # Process the query
                             response = self.process_text_query(query)
                             
-                            # Speak the response
-                            self.speak_response(response)
+                            # Speak the response, streaming sentence by sentence
+                            with self._audio_lock:
+                                self.speak_response_streaming(response)
                     
                     # Check for exit word
-                    if self.exit_word in transcribed_text:
-                        self.speak_response("நன்றி, பயன்பாட்டை மூடுகிறது.")
+                    if 'exit' in found:
+                        self._capture_stop_event.set()
+                        with self._audio_lock:
+                            self.speak_response(self.GOODBYE_MESSAGE)
                         break
-                
-                # Small delay between listening cycles
-                time.sleep(0.5)
+                finally:
+                    self._speaking.clear()
                 
         except KeyboardInterrupt:
             print("\n⏹️ கேட்டல் நிறுத்தப்பட்டது")
         finally:
+            self._capture_stop_event.set()
+            # Wait for the producer so a restart never runs two of them
+            capture_thread.join()
+            self._speaking.clear()
             self.is_listening = False
+            self.flush_query_cache()
+    
+    def _capture_loop(self):
+        """Producer: record and transcribe continuously into command_queue"""
+        assistant_config = self.config.get('assistant', {})
+        always_transcribe = assistant_config.get('always_transcribe', False)
+        speech_threshold = assistant_config.get('speech_threshold', 0.01)
+        
+        while not (self._capture_stop_event.is_set() or self.stop_event.is_set()):
+            # Stay off the microphone while the assistant is answering
+            if self._speaking.is_set():
+                self._capture_stop_event.wait(0.05)
+                continue
+            
+            # Listen for audio
+            print("\n🔴 கேட்கிறது... (பேசுங்கள்)")
+            try:
+                with self._audio_lock:
+                    audio_data = self.stt_engine.record_audio(duration=5)
+                
+                # Only wake Whisper when the block has speech energy
+                if not (always_transcribe
+                        or self.stt_engine.has_speech(audio_data, threshold=speech_threshold)):
+                    continue
+                transcribed_text = self.stt_engine.transcribe_audio(audio_data)
+            except Exception as e:
+                logger.error(f"❌ கேட்டல் பிழை: {e}")
+                self._capture_stop_event.wait(1.0)
+                continue
+            
+            # Skip silence so the consumer isn't woken for nothing. Capture
+            # stays paused until the consumer has answered this transcript
+            if transcribed_text:
+                self._speaking.set()
+                self.command_queue.put(transcribed_text)
+    
+    def _on_knowledge_base_changed(self):
+        """Drop everything derived from the previously indexed documents"""
+        self._kb_version += 1
+        self._clear_query_cache()
     
     def rebuild_knowledge_base(self):
         """Rebuild the knowledge base with current documents"""
         if self.knowledge_base:
             print("🔄 அறிவுத் தளத்தை மீண்டும் உருவாக்குகிறது...")
             self.knowledge_base.build_knowledge_base(force_rebuild=True)
+            self._on_knowledge_base_changed()
             print("✅ அறிவுத் தளம் மீண்டும் உருவாக்கப்பட்டது")
     
-    def get_conversation_history(self):
-        """Get conversation history"""
-        return self.conversation_history.copy()
+    def add_documents_batched(self, paths, batch_size: int = 100):
+        """
+        Index newly added documents in batches instead of a full rebuild
+        
+        Args:
+            paths: Paths of the new documents
+            batch_size: Number of chunks per vector store call
+        """
+        if self.knowledge_base:
+            print("🔄 புதிய ஆவணங்களை அறிவுத் தளத்தில் சேர்க்கிறது...")
+            self.knowledge_base.add_documents([str(p) for p in paths], batch_size=batch_size)
+            self._on_knowledge_base_changed()
+            print("✅ புதிய ஆவணங்கள் சேர்க்கப்பட்டன")
+    
+    def index_document(self, path):
+        """
+        Index a single new or updated document
+        
+        Args:
+            path: Path of the document
+        """
+        if self.knowledge_base:
+            self.knowledge_base.index_document(str(path))
+            self._on_knowledge_base_changed()
+    
+    def get_conversation_history(self) -> tuple:
+        """Get conversation history (read-only snapshot, reused until it changes)"""
+        if self._history_view is None:
+            self._history_view = tuple(
+                {'role': turn.role, 'content': turn.content, 'timestamp': self._format_ts(turn.ts_ns)}
+                for turn in self.conversation_history
+            )
+        return self._history_view
+    
+    @staticmethod
+    def _format_ts(ns: int) -> str:
+        """Format a time.time_ns() timestamp as an ISO string"""
+        return datetime.fromtimestamp(ns / 1e9).isoformat(timespec='seconds')
     
     def clear_conversation_history(self):
         """Clear conversation history"""
-        self.conversation_history = []
+        self.conversation_history.clear()
+        self._history_view = None
         print("🗑️ உரையாடல் வரலாறு அழிக்கப்பட்டது")
\ No newline at end of file